@@ -50,6 +50,14 @@ class Settings(BaseSettings):
         default=768,
         description="Embedding vector dimensions",
     )
+    embedding_batch_size: int = Field(
+        default=64,
+        description="Number of texts embedded per model call",
+    )
+    embedding_cache_max_entries: int = Field(
+        default=200_000,
+        description="Embedding vectors cached before the least recently used are evicted",
+    )
 
     # Ollama settings
     ollama_base_url: str = Field(
@@ -66,6 +74,14 @@ class Settings(BaseSettings):
         default="code_embeddings",
         description="ChromaDB collection name",
     )
+    chromadb_hnsw_sync_threshold: int = Field(
+        default=100,
+        description="Vectors buffered before ChromaDB syncs its HNSW index to disk",
+    )
+    chromadb_hnsw_batch_size: int = Field(
+        default=100,
+        description="Vectors buffered before ChromaDB adds them to its HNSW index",
+    )
 
     # Watcher settings
     debounce_seconds: float = Field(
@@ -120,6 +136,16 @@ class Settings(BaseSettings):
         """Get the ChromaDB storage path."""
         return self.repo_path / self.persist_dir / "chromadb"
 
+    @property
+    def embedding_cache_path(self) -> Path:
+        """Get the embedding cache database path."""
+        return self.repo_path / self.persist_dir / "embedding_cache.sqlite"
+
+    @property
+    def parse_cache_path(self) -> Path:
+        """Get the parse cache database path."""
+        return self.repo_path / self.persist_dir / "parse_cache.sqlite"
+
     @property
     def graph_pickle_path(self) -> Path:
         """Get the graph pickle storage path."""
@@ -1,5 +1,6 @@
 """Embeddings module for vector storage and semantic search."""
 
+from .cache import EmbeddingCache
 from .generator import (
     EmbeddingBackend,
     EmbeddingGenerator,
@@ -12,6 +13,7 @@ from .sync import EmbeddingSync, SyncResult
 __all__ = [
     "ChromaDBStorage",
     "EmbeddingBackend",
+    "EmbeddingCache",
     "EmbeddingGenerator",
     "EmbeddingSync",
     "OllamaBackend",
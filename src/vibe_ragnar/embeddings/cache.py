@@ -0,0 +1,148 @@
+"""Content-addressed cache of embedding vectors persisted in SQLite."""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Cache embedding vectors keyed by the hash of the embedded text and model.
+
+    Re-embedding text that was embedded before (no-op saves, reverted edits,
+    reindexing) returns the stored vector instead of running the model again.
+    Once the cache holds more than max_entries vectors, the least recently
+    used ones are evicted.
+    """
+
+    def __init__(self, db_path: Path, model: str, max_entries: int = 200_000):
+        """Initialize the cache.
+
+        Args:
+            db_path: Path of the SQLite database file
+            model: Identifier of the embedding model; vectors from other models
+                are never returned
+            max_entries: Number of vectors kept, across all models
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._model = model
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        # Shared by the indexing and watcher threads, guarded by _lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "hash BLOB NOT NULL, model TEXT NOT NULL, vector BLOB NOT NULL, "
+            "last_used INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (hash, model))"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embedding_cache)")}
+        if "last_used" not in columns:
+            # Caches written before eviction existed; their rows are evicted first
+            self._conn.execute(
+                "ALTER TABLE embedding_cache ADD COLUMN last_used INTEGER NOT NULL DEFAULT 0"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embedding_cache_last_used ON embedding_cache (last_used)"
+        )
+        self._conn.commit()
+        # Upper bound on the row count; replaced rows are counted again until
+        # the next prune recounts
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        self._prune()
+        logger.info(f"Embedding cache at {db_path}")
+
+    @staticmethod
+    def text_hash(text: str) -> bytes:
+        """Hash a text as stored in the cache.
+
+        Args:
+            text: Text that is embedded
+
+        Returns:
+            SHA-256 digest of the text
+        """
+        return hashlib.sha256(text.encode()).digest()
+
+    def get_many(self, hashes: list[bytes]) -> dict[bytes, list[float]]:
+        """Look up cached vectors.
+
+        Args:
+            hashes: Text hashes to look up
+
+        Returns:
+            Dictionary mapping each cached hash to its vector
+        """
+        found: dict[bytes, list[float]] = {}
+        now = int(time.time())
+        # Stay below SQLite's bound-parameter limit
+        chunk_size = 500
+        with self._lock:
+            for i in range(0, len(hashes), chunk_size):
+                chunk = hashes[i : i + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT hash, vector FROM embedding_cache "
+                    f"WHERE model = ? AND hash IN ({placeholders})",
+                    [self._model, *chunk],
+                )
+                for text_hash, blob in rows:
+                    found[text_hash] = array("f", blob).tolist()
+            if found:
+                self._conn.executemany(
+                    "UPDATE embedding_cache SET last_used = ? WHERE hash = ? AND model = ?",
+                    [(now, text_hash, self._model) for text_hash in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, items: list[tuple[bytes, list[float]]]) -> None:
+        """Store vectors, evicting the least recently used ones beyond the bound.
+
+        Args:
+            items: (text hash, vector) pairs
+        """
+        if not items:
+            return
+        now = int(time.time())
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (hash, model, vector, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (text_hash, self._model, array("f", vector).tobytes(), now)
+                    for text_hash, vector in items
+                ],
+            )
+            self._conn.commit()
+            self._size += len(items)
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete the least recently used vectors beyond max_entries.
+
+        Must be called with the lock held (or before the cache is shared).
+        """
+        if self._size <= self._max_entries:
+            return
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        excess = self._size - self._max_entries
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM embedding_cache WHERE rowid IN "
+            "(SELECT rowid FROM embedding_cache ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        self._conn.commit()
+        self._size -= excess
+        logger.debug(f"Evicted {excess} least recently used embeddings from the cache")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -5,6 +5,7 @@ from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
 from ..parser.entities import Class, EmbeddableEntity, Function, TypeDefinition
+from .cache import EmbeddingCache
 
 if TYPE_CHECKING:
     from ..config import Settings
@@ -35,18 +36,20 @@ class SentenceTransformersBackend(EmbeddingBackend):
     DOCUMENT_PREFIX = "search_document: "
     QUERY_PREFIX = "search_query: "
 
-    def __init__(self, model_name: str, dimensions: int | None = None):
+    def __init__(self, model_name: str, dimensions: int | None = None, batch_size: int = 64):
         """Initialize the sentence-transformers backend.
 
         Args:
             model_name: Name of the model to use (e.g., 'nomic-ai/nomic-embed-text-v1.5')
             dimensions: Optional dimension truncation
+            batch_size: Number of texts per forward pass
         """
         from sentence_transformers import SentenceTransformer
 
         logger.info(f"Loading sentence-transformers model: {model_name}")
         self._model = SentenceTransformer(model_name, trust_remote_code=True)
         self._dimensions = dimensions
+        self._batch_size = batch_size
         logger.info(f"Model loaded successfully")
 
     def encode(self, texts: list[str], is_query: bool = False) -> list[list[float]]:
@@ -66,7 +69,9 @@ class SentenceTransformersBackend(EmbeddingBackend):
         prefix = self.QUERY_PREFIX if is_query else self.DOCUMENT_PREFIX
         prefixed = [prefix + t for t in texts]
 
-        embeddings = self._model.encode(prefixed, convert_to_numpy=True)
+        embeddings = self._model.encode(
+            prefixed, batch_size=self._batch_size, convert_to_numpy=True
+        )
 
         # Truncate to specified dimensions if set
         if self._dimensions:
@@ -104,12 +109,9 @@ class OllamaBackend(EmbeddingBackend):
         if not texts:
             return []
 
-        embeddings = []
-        for text in texts:
-            response = self._client.embeddings(model=self._model, prompt=text)
-            embeddings.append(response["embedding"])
-
-        return embeddings
+        # One request for the whole batch rather than one per text
+        response = self._client.embed(model=self._model, input=texts)
+        return [list(embedding) for embedding in response["embeddings"]]
 
 
 class EmbeddingGenerator:
@@ -118,13 +120,15 @@ class EmbeddingGenerator:
     # Batch limits
     MAX_BATCH_SIZE = 128
 
-    def __init__(self, backend: EmbeddingBackend):
+    def __init__(self, backend: EmbeddingBackend, cache: EmbeddingCache | None = None):
         """Initialize the embedding generator.
 
         Args:
             backend: Embedding backend to use
+            cache: Optional cache of previously computed entity embeddings
         """
         self._backend = backend
+        self._cache = cache
 
     @classmethod
     def from_config(cls, config: "Settings") -> "EmbeddingGenerator":
@@ -141,13 +145,21 @@ class EmbeddingGenerator:
                 model=config.ollama_model,
                 base_url=config.ollama_base_url,
             )
+            model_key = f"ollama:{config.ollama_model}"
         else:
             backend = SentenceTransformersBackend(
                 model_name=config.embedding_model,
                 dimensions=config.embedding_dimensions,
+                batch_size=config.embedding_batch_size,
             )
+            model_key = f"{config.embedding_model}:{config.embedding_dimensions}"
 
-        return cls(backend)
+        cache = EmbeddingCache(
+            config.embedding_cache_path,
+            model_key,
+            max_entries=config.embedding_cache_max_entries,
+        )
+        return cls(backend, cache=cache)
 
     def generate(self, text: str, input_type: str = "document") -> list[float]:
         """Generate embedding for a single text.
@@ -315,7 +327,40 @@ class EmbeddingGenerator:
         texts = [self.prepare_entity_text(e) for e in entities]
 
         # Generate embeddings
-        embeddings = self.generate_batch(texts)
+        if self._cache is None:
+            embeddings = self.generate_batch(texts)
+        else:
+            embeddings = self._generate_cached(texts)
 
         # Pair with entities
         return list(zip(entities, embeddings))
+
+    def _generate_cached(self, texts: list[str]) -> list[list[float]]:
+        """Generate document embeddings, reusing cached vectors where possible.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors, in input order
+        """
+        assert self._cache is not None
+        hashes = [EmbeddingCache.text_hash(t) for t in texts]
+        cached = self._cache.get_many(hashes)
+
+        # Embed each distinct uncached text once
+        misses = list(dict.fromkeys(h for h in hashes if h not in cached))
+        if misses:
+            text_by_hash = dict(zip(hashes, texts, strict=True))
+            new_embeddings = self.generate_batch([text_by_hash[h] for h in misses])
+            new_items = list(zip(misses, new_embeddings, strict=True))
+            self._cache.put_many(new_items)
+            cached.update(new_items)
+
+        logger.debug(f"Embedding cache: {len(texts) - len(misses)} hits, {len(misses)} misses")
+        return [cached[h] for h in hashes]
+
+    def close(self) -> None:
+        """Release resources held by the generator."""
+        if self._cache is not None:
+            self._cache.close()
@@ -1,6 +1,7 @@
 """ChromaDB storage for vector embeddings."""
 
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -9,6 +10,9 @@ import chromadb
 
 logger = logging.getLogger(__name__)
 
+# Seconds a document count is reused; status endpoints are polled frequently
+_COUNT_CACHE_TTL = 5.0
+
 
 class ChromaDBStorage:
     """Storage for code embeddings using ChromaDB with local persistence."""
@@ -17,19 +21,33 @@ class ChromaDBStorage:
         self,
         persist_directory: Path,
         collection_name: str = "code_embeddings",
+        hnsw_sync_threshold: int = 100,
+        hnsw_batch_size: int = 100,
     ):
         """Initialize ChromaDB connection.
 
         Args:
             persist_directory: Directory for persistent storage
             collection_name: Collection name for embeddings
+            hnsw_sync_threshold: Vectors buffered before the HNSW index is
+                synced to disk (ChromaDB's default is 1000, too coarse for the
+                small incremental updates of the file watcher)
+            hnsw_batch_size: Vectors buffered in memory before they are added
+                to the HNSW index; must not exceed hnsw_sync_threshold
         """
         persist_directory.mkdir(parents=True, exist_ok=True)
         self._client = chromadb.PersistentClient(path=str(persist_directory))
+        # HNSW settings only apply when the collection is created
         self._collection = self._client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"},
+            metadata={
+                "hnsw:space": "cosine",
+                "hnsw:sync_threshold": hnsw_sync_threshold,
+                "hnsw:batch_size": min(hnsw_batch_size, hnsw_sync_threshold),
+            },
         )
+        # Filter key -> (monotonic time, count), cleared on every write
+        self._count_cache: dict[str, tuple[float, int]] = {}
         logger.info(f"ChromaDB initialized at {persist_directory}")
 
     def upsert_embedding(
@@ -46,6 +64,7 @@ class ChromaDBStorage:
             metadata: Entity metadata (content_hash, entity_type, file_path, etc.)
         """
         flat_metadata = self._flatten_metadata(metadata)
+        self._count_cache.clear()
         self._collection.upsert(
             ids=[entity_id],
             embeddings=[embedding],
@@ -76,6 +95,7 @@ class ChromaDBStorage:
             embeddings.append(embedding)
             metadatas.append(self._flatten_metadata(metadata))
 
+        self._count_cache.clear()
         self._collection.upsert(
             ids=ids,
             embeddings=embeddings,
@@ -123,6 +143,7 @@ class ChromaDBStorage:
             True if deleted (ChromaDB doesn't report actual deletion)
         """
         try:
+            self._count_cache.clear()
             self._collection.delete(ids=[entity_id])
             return True
         except Exception:
@@ -144,6 +165,7 @@ class ChromaDBStorage:
         )
 
         if results["ids"]:
+            self._count_cache.clear()
             self._collection.delete(ids=results["ids"])
             return len(results["ids"])
 
@@ -161,6 +183,7 @@ class ChromaDBStorage:
         results = self._collection.get(where={"repo": repo})
 
         if results["ids"]:
+            self._count_cache.clear()
             self._collection.delete(ids=results["ids"])
             return len(results["ids"])
 
@@ -189,6 +212,32 @@ class ChromaDBStorage:
 
         return None
 
+    def get_file_embeddings(self, repo: str, file_path: str) -> dict[str, tuple[list[float], str]]:
+        """Get the stored vectors and content hashes of a file's entities.
+
+        Args:
+            repo: Repository name
+            file_path: File path
+
+        Returns:
+            Dictionary mapping entity_id to (embedding, content_hash)
+        """
+        results = self._collection.get(
+            where={"$and": [{"repo": repo}, {"file_path": file_path}]},
+            include=["embeddings", "metadatas"],
+        )
+
+        stored: dict[str, tuple[list[float], str]] = {}
+        for i, entity_id in enumerate(results["ids"]):
+            metadata = results["metadatas"][i] if results["metadatas"] else {}
+            content_hash = metadata.get("content_hash", "")
+            stored[entity_id] = (
+                list(results["embeddings"][i]),
+                content_hash if isinstance(content_hash, str) else "",
+            )
+
+        return stored
+
     def get_content_hashes(self, repo: str) -> dict[str, str]:
         """Get all entity IDs and their content hashes for a repository.
 
@@ -304,10 +353,19 @@ class ChromaDBStorage:
         Returns:
             Document count
         """
+        key = repr(sorted(filter.items())) if filter else ""
+        cached = self._count_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < _COUNT_CACHE_TTL:
+            return cached[1]
+
         if filter:
-            results = self._collection.get(where=filter)
-            return len(results["ids"])
-        return self._collection.count()
+            # Only the IDs are needed, skip loading metadata and documents
+            count = len(self._collection.get(where=filter, include=[])["ids"])
+        else:
+            count = self._collection.count()
+        self._count_cache[key] = (now, count)
+        return count
 
     def close(self) -> None:
         """Close the ChromaDB connection (no-op for PersistentClient)."""
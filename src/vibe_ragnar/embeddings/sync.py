@@ -42,13 +42,14 @@ class SyncResult:
 class EmbeddingSync:
     """Synchronize embeddings between parsed entities and ChromaDB storage."""
 
-    BATCH_SIZE = 32  # Batch size for embedding generation
+    BATCH_SIZE = 64  # Default batch size for embedding generation
 
     def __init__(
         self,
         generator: EmbeddingGenerator,
         storage: ChromaDBStorage,
         repo_name: str,
+        batch_size: int = BATCH_SIZE,
     ):
         """Initialize the sync manager.
 
@@ -56,10 +57,12 @@ class EmbeddingSync:
             generator: Embedding generator instance
             storage: MongoDB storage instance
             repo_name: Name of the repository
+            batch_size: Entities embedded and upserted together
         """
         self._generator = generator
         self._storage = storage
         self._repo_name = repo_name
+        self._batch_size = batch_size
 
     def sync_entities(self, entities: list[AnyEntity]) -> SyncResult:
         """Synchronize entities with the embedding storage.
@@ -134,8 +137,8 @@ class EmbeddingSync:
                 result.errors.append(f"Failed to delete {entity_id}: {e}")
 
         # Generate and store embeddings in batches
-        for i in range(0, len(to_embed), self.BATCH_SIZE):
-            batch = to_embed[i : i + self.BATCH_SIZE]
+        for i in range(0, len(to_embed), self._batch_size):
+            batch = to_embed[i : i + self._batch_size]
             try:
                 self._process_batch(batch)
             except Exception as e:
@@ -165,41 +168,58 @@ class EmbeddingSync:
         Returns:
             SyncResult with counts
         """
-        result = SyncResult()
+        result = self.sync_files([(file_path, entities)])
+        logger.debug(f"File sync for {file_path}: {result}")
+        return result
 
-        # Filter to embeddable entities
-        embeddable = [e for e in entities if self._is_embeddable(e)]
+    def sync_files(self, files: list[tuple[str, list[AnyEntity]]]) -> SyncResult:
+        """Synchronize entities for several changed files at once.
 
-        # Get existing entities for this file
+        Existing hashes are fetched once and the changed entities of all files
+        are embedded and upserted together, rather than once per file.
+
+        Args:
+            files: (file path, entities parsed from the file) pairs
+
+        Returns:
+            SyncResult with counts across all files
+        """
+        result = SyncResult()
+        if not files:
+            return result
+
+        # Get existing entities for the changed files
+        file_paths = {file_path for file_path, _ in files}
         existing = self._storage.get_content_hashes(self._repo_name)
-        existing_in_file = {
+        existing_in_files = {
             eid: h for eid, h in existing.items()
-            if self._get_file_from_id(eid) == file_path
+            if self._get_file_from_id(eid) in file_paths
         }
 
         # Categorize
         to_embed: list[EmbeddableEntity] = []
         current_ids: set[str] = set()
 
-        for entity in embeddable:
-            entity_embeddable = self._cast_embeddable(entity)
-            if entity_embeddable is None:
-                continue
-
-            current_ids.add(entity.id)
-            existing_hash = existing_in_file.get(entity.id)
-
-            if existing_hash is None:
-                to_embed.append(entity_embeddable)
-                result.added += 1
-            elif existing_hash != entity_embeddable.content_hash:
-                to_embed.append(entity_embeddable)
-                result.updated += 1
-            else:
-                result.skipped += 1
-
-        # Delete entities that no longer exist in this file
-        to_delete = set(existing_in_file.keys()) - current_ids
+        for _, entities in files:
+            for entity in entities:
+                entity_embeddable = self._cast_embeddable(entity)
+                if entity_embeddable is None:
+                    continue
+
+                current_ids.add(entity.id)
+                existing_hash = existing_in_files.get(entity.id)
+
+                if existing_hash is None:
+                    to_embed.append(entity_embeddable)
+                    result.added += 1
+                elif existing_hash != entity_embeddable.content_hash:
+                    to_embed.append(entity_embeddable)
+                    result.updated += 1
+                else:
+                    result.skipped += 1
+
+        # Delete entities that no longer exist in these files
+        to_delete = set(existing_in_files.keys()) - current_ids
         for entity_id in to_delete:
             try:
                 self._storage.delete_embedding(entity_id)
@@ -208,15 +228,81 @@ class EmbeddingSync:
                 result.errors.append(f"Failed to delete {entity_id}: {e}")
 
         # Generate and store embeddings
-        for i in range(0, len(to_embed), self.BATCH_SIZE):
-            batch = to_embed[i : i + self.BATCH_SIZE]
+        for i in range(0, len(to_embed), self._batch_size):
+            batch = to_embed[i : i + self._batch_size]
             try:
                 self._process_batch(batch)
             except Exception as e:
                 for entity in batch:
                     result.errors.append(f"Failed to embed {entity.id}: {e}")
 
-        logger.debug(f"File sync for {file_path}: {result}")
+        return result
+
+    def move_file(
+        self,
+        old_file_path: str,
+        new_file_path: str,
+        entities: list[AnyEntity],
+    ) -> SyncResult:
+        """Move the embeddings of a renamed file to its new path.
+
+        Entities whose embedding text is unchanged by the move keep their
+        stored vector under their new ID instead of being embedded again; the
+        rest are embedded. The text names the file, so this only holds for
+        entity types whose text does not include the path.
+        Embeddings already stored under the new path (a move over an existing
+        file) are replaced, and all embeddings under the old path are removed.
+
+        Args:
+            old_file_path: Path of the file before the move
+            new_file_path: Path of the file after the move
+            entities: Entities parsed from the file at its new path
+
+        Returns:
+            SyncResult with counts (reused vectors are counted as skipped)
+        """
+        result = SyncResult()
+        stored = self._storage.get_file_embeddings(self._repo_name, old_file_path)
+
+        reused: list[tuple[str, list[float], dict[str, Any]]] = []
+        to_embed: list[EmbeddableEntity] = []
+        for entity in entities:
+            entity_embeddable = self._cast_embeddable(entity)
+            if entity_embeddable is None:
+                continue
+
+            old_entity = entity_embeddable.model_copy(update={"file_path": old_file_path})
+            old = stored.get(old_entity.id)
+            if (
+                old is not None
+                and old[1] == entity_embeddable.content_hash
+                and self._generator.prepare_entity_text(old_entity)
+                == self._generator.prepare_entity_text(entity_embeddable)
+            ):
+                metadata = self._entity_to_metadata(entity_embeddable)
+                reused.append((entity_embeddable.id, old[0], metadata))
+                result.skipped += 1
+            else:
+                to_embed.append(entity_embeddable)
+                result.added += 1
+
+        try:
+            # Drop what the overwritten destination file had stored
+            result.deleted += self._storage.delete_by_file(self._repo_name, new_file_path)
+            self._storage.bulk_upsert(reused)
+        except Exception as e:
+            result.errors.append(f"Failed to move embeddings to {new_file_path}: {e}")
+
+        for i in range(0, len(to_embed), self._batch_size):
+            batch = to_embed[i : i + self._batch_size]
+            try:
+                self._process_batch(batch)
+            except Exception as e:
+                for entity in batch:
+                    result.errors.append(f"Failed to embed {entity.id}: {e}")
+
+        result.deleted += self._storage.delete_by_file(self._repo_name, old_file_path)
+        logger.debug(f"File move {old_file_path} -> {new_file_path}: {result}")
         return result
 
     def delete_file(self, file_path: str) -> int:
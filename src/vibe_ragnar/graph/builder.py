@@ -33,6 +33,9 @@ class ScopedSymbolTable:
     # Reverse mapping for cleanup: entity_id -> list of registered names
     entity_to_names: dict[str, list[tuple[str, str]]] = field(default_factory=dict)
 
+    # File each registered entity is defined in: entity_id -> file_path
+    entity_files: dict[str, str] = field(default_factory=dict)
+
     def register(
         self,
         entity_id: str,
@@ -76,6 +79,7 @@ class ScopedSymbolTable:
 
         # Track for cleanup
         self.entity_to_names[entity_id] = registered_names
+        self.entity_files[entity_id] = file_path
 
     def resolve(
         self,
@@ -121,15 +125,17 @@ class ScopedSymbolTable:
         if entity_id not in self.entity_to_names:
             return
 
+        file_scope = self.file_scopes.get(self.entity_files.pop(entity_id, ""), {})
+        scopes = {
+            "global": self.global_scope,
+            "qualified": self.qualified_names,
+            "file": file_scope,
+        }
         for scope_type, name in self.entity_to_names[entity_id]:
-            if scope_type == "global":
-                self.global_scope.pop(name, None)
-            elif scope_type == "qualified":
-                self.qualified_names.pop(name, None)
-            elif scope_type == "file":
-                # Find and remove from file scopes
-                for file_scope in self.file_scopes.values():
-                    file_scope.pop(name, None)
+            scope = scopes[scope_type]
+            # Leave names that were since registered by another entity
+            if scope.get(name) == entity_id:
+                del scope[name]
 
         del self.entity_to_names[entity_id]
 
@@ -154,6 +160,7 @@ class ScopedSymbolTable:
         self.file_scopes.clear()
         self.qualified_names.clear()
         self.entity_to_names.clear()
+        self.entity_files.clear()
 
     def get_all_symbols_in_file(self, file_path: str) -> dict[str, str]:
         """Get all symbols defined in a file.
@@ -206,8 +213,8 @@ class GraphBuilder:
         self._import_resolver.set_known_files(known_files)
 
         # First pass: add all nodes
+        self._storage.add_entities(entities)
         for entity in entities:
-            self._storage.add_entity(entity)
             self._register_symbol(entity)
 
         # Second pass: build relationships
@@ -420,23 +427,21 @@ class GraphBuilder:
         """
         file_path_str = str(file_path)
 
-        # Remove old entities and symbols
-        removed = self._storage.remove_file(file_path_str)
-        logger.debug(f"Removed {len(removed)} entities from {file_path_str}")
-
-        # Remove old symbols from symbol table
-        for entity_id in removed:
-            self._symbol_table.unregister(entity_id)
+        # Remove old entities and symbols, keeping the edges other files had into them
+        incoming = self._remove_file_entities(file_path_str)
 
         # Add new entities
+        self._storage.add_entities(entities)
         for entity in entities:
-            self._storage.add_entity(entity)
             self._register_symbol(entity)
 
         # Rebuild edges for new entities
         for entity in entities:
             self._build_edges(entity)
 
+        # Restore references from other files to entities that still exist
+        self._relink_incoming(incoming)
+
         logger.debug(f"Added {len(entities)} entities from {file_path_str}")
 
     def remove_file(self, file_path: Path) -> None:
@@ -446,13 +451,57 @@ class GraphBuilder:
             file_path: Path to the file to remove
         """
         file_path_str = str(file_path)
-        removed = self._storage.remove_file(file_path_str)
+        incoming = self._remove_file_entities(file_path_str)
+
+        # References from other files now point to unresolved symbols
+        self._relink_incoming(incoming)
+
+    def _remove_file_entities(self, file_path: str) -> list[tuple[str, str, str, EdgeType]]:
+        """Remove a file's entities from the graph and the symbol table.
+
+        Removing a node also drops the edges other files had into it; those
+        are returned so they can be restored once the file is re-added.
+
+        Args:
+            file_path: Path of the file
 
-        # Remove from symbol table
+        Returns:
+            List of (source_id, target_id, target_name, edge_type) for edges from
+            entities outside the file to entities of the file
+        """
+        entity_ids = set(self._storage.get_entities_by_file(file_path))
+        nodes = self._storage.graph.nodes
+        incoming = [
+            (source_id, target_id, nodes[target_id].get("name", ""), EdgeType(edge_data["type"]))
+            for target_id in entity_ids
+            for source_id, edge_data in self._storage.get_predecessors(target_id)
+            if source_id not in entity_ids
+        ]
+
+        removed = self._storage.remove_file(file_path)
         for entity_id in removed:
             self._symbol_table.unregister(entity_id)
 
-        logger.debug(f"Removed {len(removed)} entities from {file_path_str}")
+        logger.debug(f"Removed {len(removed)} entities from {file_path}")
+        return incoming
+
+    def _relink_incoming(self, incoming: list[tuple[str, str, str, EdgeType]]) -> None:
+        """Restore edges returned by _remove_file_entities.
+
+        Edges whose target was re-added (entity IDs are stable across edits)
+        are restored as they were; the others point to an external placeholder
+        by name, as a full build would, so a later definition resolves them.
+
+        Args:
+            incoming: Edges returned by _remove_file_entities
+        """
+        for source_id, target_id, target_name, edge_type in incoming:
+            if self._storage.has_entity(target_id):
+                self._storage.add_edge(source_id, target_id, edge_type)
+            elif target_name:
+                self._storage.add_edge_by_name(
+                    source_id, target_name, edge_type, create_if_missing=True
+                )
 
     def clear(self) -> None:
         """Clear the graph and symbol table."""
@@ -229,8 +229,11 @@ def find_symbol(
         List of matching entities, sorted by relevance
     """
     results = []
+    nodes = storage.graph.nodes
 
-    for node_id, data in storage.graph.nodes(data=True):
+    # Only nodes sharing the unqualified name can match
+    for node_id in storage.get_entities_by_symbol(name):
+        data = nodes[node_id]
         node_name = data.get("name", "")
 
         # Exact match
@@ -346,9 +349,9 @@ def get_connected_components(storage: GraphStorage) -> list[list[str]]:
     Returns:
         List of component lists (each component is a list of entity IDs)
     """
-    # Use weakly connected components for directed graph
-    components = list(nx.weakly_connected_components(storage.graph))
-    return [list(comp) for comp in components]
+    # Use weakly connected components for directed graph (a linear-time
+    # traversal, so there is no need for a sparse-matrix representation)
+    return [list(comp) for comp in nx.weakly_connected_components(storage.graph)]
 
 
 def find_paths(
@@ -368,6 +371,18 @@ def find_paths(
     Returns:
         List of paths (each path is a list of entity IDs)
     """
+    if source_id not in storage.graph or target_id not in storage.graph:
+        return []
+
+    # Enumerating simple paths explores every route up to max_length even when
+    # none reaches the target; a bidirectional BFS rules that out first.
+    try:
+        shortest = nx.bidirectional_shortest_path(storage.graph, source_id, target_id)
+    except nx.NetworkXNoPath:
+        return []
+    if len(shortest) - 1 > max_length:
+        return []
+
     try:
         paths = list(
             nx.all_simple_paths(
@@ -1,7 +1,10 @@
 """Graph storage using NetworkX for in-memory code dependency graph with pickle persistence."""
 
 import logging
+import os
 import pickle
+import threading
+from collections.abc import Iterable, Mapping
 from enum import Enum
 from pathlib import Path
 from typing import Any
@@ -12,6 +15,42 @@ from ..parser.entities import AnyEntity, Class, EntityType, File, Function, Type
 
 logger = logging.getLogger(__name__)
 
+# Version of the flat node/edge list format written by GraphStorage.save
+_GRAPH_FORMAT_VERSION = 1
+
+
+def _symbol_key(name: str) -> str:
+    """Return the last `.` or `:` separated component of a name or entity ID.
+
+    Args:
+        name: Name or entity ID
+
+    Returns:
+        The unqualified symbol name
+    """
+    return name.rsplit(":", 1)[-1].rsplit(".", 1)[-1]
+
+
+def _filter_adjacency(
+    neighbors: Mapping[str, dict[str, Any]], edge_type: "EdgeType | None"
+) -> list[tuple[str, dict[str, Any]]]:
+    """Select the neighbors connected by edges of a given type.
+
+    Reads the node's adjacency mapping directly instead of going through an
+    edge view, which builds a (u, v, data) tuple per edge.
+
+    Args:
+        neighbors: Neighbor ID -> edge data mapping of one node
+        edge_type: Edge type to keep, or None for all edges
+
+    Returns:
+        List of (neighbor_id, edge_data) tuples
+    """
+    if edge_type is None:
+        return list(neighbors.items())
+    value = edge_type.value
+    return [(node_id, data) for node_id, data in neighbors.items() if data.get("type") == value]
+
 
 class EdgeType(str, Enum):
     """Types of edges in the code graph."""
@@ -36,8 +75,23 @@ class GraphStorage:
         self._persist_path = persist_path
         self._graph = nx.DiGraph()
 
+        # Held while saving; hold it around mutations that may run concurrently
+        # with a save from another thread
+        self._lock = threading.RLock()
+
+        # get_statistics() result, reset by every mutation
+        self._stats: dict[str, int] | None = None
+        # Symbol key -> node IDs, built on demand and then kept up to date by
+        # node additions and removals
+        self._symbol_index: dict[str, list[str]] | None = None
+
+        # Write-ahead log of mutations since the last save; ops are buffered
+        # in memory until flush_wal() appends them (only with persistence)
+        self._wal_path = persist_path.with_suffix(".wal") if persist_path else None
+        self._wal_ops: list[tuple[Any, ...]] | None = [] if persist_path else None
+
         # Try to load from disk if path exists
-        if persist_path and persist_path.exists():
+        if persist_path and (persist_path.exists() or self._wal_path.exists()):
             self.load()
 
     @property
@@ -45,21 +99,69 @@ class GraphStorage:
         """Access the underlying NetworkX graph."""
         return self._graph
 
+    @property
+    def lock(self) -> threading.RLock:
+        """Lock serializing graph mutations with background saves."""
+        return self._lock
+
     def add_entity(self, entity: AnyEntity) -> None:
         """Add an entity as a node in the graph.
 
+        The entity's source code is not copied into the node: it is only needed
+        for embeddings (where it is kept in ChromaDB metadata) and would
+        otherwise dominate the graph's memory and pickle size.
+
         Args:
             entity: The code entity to add
         """
-        self._graph.add_node(
-            entity.id,
-            type=entity.entity_type.value,
-            name=entity.name,
-            file_path=entity.file_path,
-            start_line=entity.start_line,
-            end_line=entity.end_line,
-            data=entity.model_dump(),
-        )
+        self._add_node(entity.id, self._node_attributes(entity))
+
+    def add_entities(self, entities: Iterable[AnyEntity]) -> None:
+        """Add several entities as nodes in one graph update.
+
+        Args:
+            entities: The code entities to add
+        """
+        nodes = [(entity.id, self._node_attributes(entity)) for entity in entities]
+        if not nodes:
+            return
+        self._stats = None
+        if self._symbol_index is None:
+            self._graph.add_nodes_from(nodes)
+        else:
+            graph_nodes = self._graph.nodes
+            # (is new, previous name) per node ID, taken before the update
+            previous = {
+                node_id: (
+                    node_id not in graph_nodes,
+                    graph_nodes[node_id].get("name") if node_id in graph_nodes else None,
+                )
+                for node_id, _ in nodes
+            }
+            self._graph.add_nodes_from(nodes)
+            for node_id, (is_new, old_name) in previous.items():
+                self._reindex_node(node_id, is_new, old_name)
+        if self._wal_ops is not None:
+            self._wal_ops.extend(("add_node", node_id, attrs) for node_id, attrs in nodes)
+
+    @staticmethod
+    def _node_attributes(entity: AnyEntity) -> dict[str, Any]:
+        """Build the node attributes stored for an entity.
+
+        Args:
+            entity: The code entity
+
+        Returns:
+            Node attribute dictionary
+        """
+        return {
+            "type": entity.entity_type.value,
+            "name": entity.name,
+            "file_path": entity.file_path,
+            "start_line": entity.start_line,
+            "end_line": entity.end_line,
+            "data": entity.model_dump(exclude={"code"}),
+        }
 
     def remove_entity(self, entity_id: str) -> None:
         """Remove an entity from the graph.
@@ -68,7 +170,7 @@ class GraphStorage:
             entity_id: ID of the entity to remove
         """
         if entity_id in self._graph:
-            self._graph.remove_node(entity_id)
+            self._remove_node(entity_id)
 
     def get_entity(self, entity_id: str) -> dict[str, Any] | None:
         """Get an entity by its ID.
@@ -104,7 +206,7 @@ class GraphStorage:
         """
         # Only add edge if both nodes exist
         if from_id in self._graph and to_id in self._graph:
-            self._graph.add_edge(from_id, to_id, type=edge_type.value)
+            self._add_edge(from_id, to_id, edge_type.value)
 
     def add_edge_by_name(
         self, from_id: str, to_name: str, edge_type: EdgeType, create_if_missing: bool = False
@@ -129,10 +231,10 @@ class GraphStorage:
         if to_id is None and create_if_missing:
             # Create external reference node
             to_id = f"external:{to_name}"
-            self._graph.add_node(to_id, type="external", name=to_name)
+            self._add_node(to_id, {"type": "external", "name": to_name})
 
         if to_id:
-            self._graph.add_edge(from_id, to_id, type=edge_type.value)
+            self._add_edge(from_id, to_id, edge_type.value)
             return True
 
         return False
@@ -146,11 +248,86 @@ class GraphStorage:
         Returns:
             Entity ID or None if not found
         """
-        for node_id, data in self._graph.nodes(data=True):
-            if data.get("name") == name:
+        nodes = self._graph.nodes
+        for node_id in self.get_entities_by_symbol(name):
+            if nodes[node_id].get("name") == name:
                 return node_id
         return None
 
+    def get_entities_by_symbol(self, name: str) -> list[str]:
+        """Get candidate entity IDs for a symbol name.
+
+        Returns every node whose name or ID shares the last `.`/`:` separated
+        component of `name`, which includes all nodes whose name equals `name`
+        or whose name or ID ends with it. Callers filter the candidates further.
+
+        Args:
+            name: Symbol name, optionally qualified (e.g. "Class.method")
+
+        Returns:
+            List of entity IDs, in graph order
+        """
+        key = _symbol_key(name)
+        if not key:
+            return list(self._graph.nodes)
+
+        if self._symbol_index is None:
+            self._symbol_index = {}
+            for node_id, node_name in self._graph.nodes(data="name"):
+                self._index_node(node_id, node_name)
+        return list(self._symbol_index.get(key, ()))
+
+    def _index_node(self, node_id: str, name: str | None) -> None:
+        """Add a node to the symbol index, if it has been built.
+
+        Args:
+            node_id: ID of the node
+            name: Name of the node
+        """
+        index = self._symbol_index
+        if index is None:
+            return
+        id_key = _symbol_key(node_id)
+        index.setdefault(id_key, []).append(node_id)
+        name_key = _symbol_key(name or "")
+        if name_key != id_key:
+            index.setdefault(name_key, []).append(node_id)
+
+    def _reindex_node(self, node_id: str, is_new: bool, old_name: str | None) -> None:
+        """Update the symbol index after a node was added or its attributes replaced.
+
+        Args:
+            node_id: ID of the node
+            is_new: Whether the node was not in the graph before
+            old_name: Name of the node before the update
+        """
+        if self._symbol_index is None:
+            return
+        name = self._graph.nodes[node_id].get("name")
+        if is_new:
+            self._index_node(node_id, name)
+        elif _symbol_key(old_name or "") != _symbol_key(name or ""):
+            # Re-adding a node under an unchanged name keeps its index position
+            self._unindex_node(node_id, old_name)
+            self._index_node(node_id, name)
+
+    def _unindex_node(self, node_id: str, name: str | None) -> None:
+        """Remove a node from the symbol index, if it has been built.
+
+        Args:
+            node_id: ID of the node
+            name: Name the node was indexed under
+        """
+        index = self._symbol_index
+        if index is None:
+            return
+        for key in {_symbol_key(node_id), _symbol_key(name or "")}:
+            node_ids = index.get(key)
+            if node_ids is not None and node_id in node_ids:
+                node_ids.remove(node_id)
+                if not node_ids:
+                    del index[key]
+
     def get_successors(
         self, entity_id: str, edge_type: EdgeType | None = None
     ) -> list[tuple[str, dict[str, Any]]]:
@@ -163,15 +340,10 @@ class GraphStorage:
         Returns:
             List of (target_id, edge_data) tuples
         """
-        if entity_id not in self._graph:
+        targets = self._graph.succ.get(entity_id)
+        if targets is None:
             return []
-
-        result = []
-        for _, target_id, edge_data in self._graph.out_edges(entity_id, data=True):
-            if edge_type is None or edge_data.get("type") == edge_type.value:
-                result.append((target_id, edge_data))
-
-        return result
+        return _filter_adjacency(targets, edge_type)
 
     def get_predecessors(
         self, entity_id: str, edge_type: EdgeType | None = None
@@ -185,15 +357,10 @@ class GraphStorage:
         Returns:
             List of (source_id, edge_data) tuples
         """
-        if entity_id not in self._graph:
+        sources = self._graph.pred.get(entity_id)
+        if sources is None:
             return []
-
-        result = []
-        for source_id, _, edge_data in self._graph.in_edges(entity_id, data=True):
-            if edge_type is None or edge_data.get("type") == edge_type.value:
-                result.append((source_id, edge_data))
-
-        return result
+        return _filter_adjacency(sources, edge_type)
 
     def get_entities_by_type(self, entity_type: EntityType) -> list[str]:
         """Get all entity IDs of a specific type.
@@ -228,9 +395,14 @@ class GraphStorage:
     def get_statistics(self) -> dict[str, int]:
         """Get graph statistics.
 
+        The counts are cached until the graph is next modified.
+
         Returns:
             Dictionary with counts of nodes, edges, and entity types
         """
+        if self._stats is not None:
+            return dict(self._stats)
+
         stats = {
             "nodes": self._graph.number_of_nodes(),
             "edges": self._graph.number_of_edges(),
@@ -254,11 +426,21 @@ class GraphStorage:
             elif entity_type == "external":
                 stats["external"] += 1
 
-        return stats
+        self._stats = stats
+        return dict(stats)
+
+    def _invalidate_caches(self) -> None:
+        """Drop the cached statistics and symbol index when the whole graph is replaced."""
+        self._stats = None
+        self._symbol_index = None
 
     def clear(self) -> None:
         """Clear all nodes and edges from the graph."""
+        self._invalidate_caches()
         self._graph.clear()
+        if self._wal_ops is not None:
+            # Nothing logged before a clear matters on replay
+            self._wal_ops = [("clear",)]
 
     def remove_file(self, file_path: str) -> list[str]:
         """Remove all entities from a specific file.
@@ -271,9 +453,119 @@ class GraphStorage:
         """
         to_remove = self.get_entities_by_file(file_path)
         for entity_id in to_remove:
-            self._graph.remove_node(entity_id)
+            self._remove_node(entity_id)
         return to_remove
 
+    def _add_node(self, node_id: str, attrs: dict[str, Any]) -> None:
+        """Add (or replace the attributes of) a node and log the change.
+
+        Args:
+            node_id: ID of the node
+            attrs: Node attributes
+        """
+        self._stats = None
+        is_new = node_id not in self._graph
+        old_name = None if is_new else self._graph.nodes[node_id].get("name")
+        self._graph.add_node(node_id, **attrs)
+        self._reindex_node(node_id, is_new, old_name)
+        if self._wal_ops is not None:
+            self._wal_ops.append(("add_node", node_id, attrs))
+
+    def _remove_node(self, node_id: str) -> None:
+        """Remove a node and its edges and log the change.
+
+        Args:
+            node_id: ID of the node
+        """
+        self._stats = None
+        self._unindex_node(node_id, self._graph.nodes[node_id].get("name"))
+        self._graph.remove_node(node_id)
+        if self._wal_ops is not None:
+            self._wal_ops.append(("remove_node", node_id))
+
+    def _add_edge(self, from_id: str, to_id: str, edge_type: str) -> None:
+        """Add an edge and log the change.
+
+        Args:
+            from_id: Source node ID
+            to_id: Target node ID
+            edge_type: Edge type value
+        """
+        # Edges don't change which nodes a symbol resolves to
+        self._stats = None
+        self._graph.add_edge(from_id, to_id, type=edge_type)
+        if self._wal_ops is not None:
+            self._wal_ops.append(("add_edge", from_id, to_id, edge_type))
+
+    def _apply_ops(self, ops: list[tuple[Any, ...]]) -> None:
+        """Replay logged mutations onto the graph, without logging them again.
+
+        Args:
+            ops: Operations recorded by _add_node, _remove_node, _add_edge and clear
+        """
+        graph = self._graph
+        for op in ops:
+            if op[0] == "add_node":
+                graph.add_node(op[1], **op[2])
+            elif op[0] == "remove_node":
+                if op[1] in graph:
+                    graph.remove_node(op[1])
+            elif op[0] == "add_edge":
+                graph.add_edge(op[1], op[2], type=op[3])
+            elif op[0] == "clear":
+                graph.clear()
+
+    @property
+    def wal_size(self) -> int:
+        """Size in bytes of the write-ahead log on disk (0 without persistence)."""
+        if self._wal_path is None or not self._wal_path.exists():
+            return 0
+        return self._wal_path.stat().st_size
+
+    def flush_wal(self) -> bool:
+        """Append the mutations made since the last flush to the write-ahead log.
+
+        This costs O(size of the change) rather than a full save; load()
+        replays the log over the last saved graph.
+
+        Returns:
+            True if mutations were written, False if there was nothing to write
+            or writing failed
+        """
+        if self._wal_path is None or self._wal_ops is None:
+            return False
+
+        with self._lock:
+            if not self._wal_ops:
+                return False
+            ops, self._wal_ops = self._wal_ops, []
+            try:
+                self._wal_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self._wal_path, "ab") as f:
+                    pickle.dump(ops, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    f.flush()
+                    os.fsync(f.fileno())
+                return True
+            except Exception as e:
+                logger.error(f"Failed to write graph log: {e}")
+                # Keep the ops so the next flush (or save) still covers them
+                self._wal_ops = ops + self._wal_ops
+                return False
+
+    def compact_if_needed(self, max_wal_bytes: int) -> bool:
+        """Save the full graph once the write-ahead log has grown too large.
+
+        Args:
+            max_wal_bytes: Log size above which the graph is saved and the log
+                truncated
+
+        Returns:
+            True if the graph was saved
+        """
+        if self.wal_size <= max_wal_bytes:
+            return False
+        return self.save()
+
     def save(self) -> bool:
         """Save the graph to disk using pickle.
 
@@ -283,15 +575,60 @@ class GraphStorage:
         if not self._persist_path:
             return False
 
-        try:
-            self._persist_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._persist_path, "wb") as f:
-                pickle.dump(self._graph, f, protocol=pickle.HIGHEST_PROTOCOL)
-            logger.info(f"Graph saved to {self._persist_path}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save graph: {e}")
-            return False
+        with self._lock:
+            try:
+                self._persist_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self._persist_path, "wb") as f:
+                    pickle.dump(self._to_state(), f, protocol=pickle.HIGHEST_PROTOCOL)
+                # The saved graph includes every logged mutation
+                self._wal_ops = []
+                if self._wal_path is not None:
+                    self._wal_path.unlink(missing_ok=True)
+                logger.info(f"Graph saved to {self._persist_path}")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to save graph: {e}")
+                return False
+
+    def _to_state(self) -> dict[str, Any]:
+        """Flatten the graph into node and edge lists for pickling.
+
+        Pickling the DiGraph itself serializes its adjacency dicts twice (successors
+        and predecessors) plus one attribute dict per edge; two flat lists are
+        smaller and faster to write and read back.
+
+        Returns:
+            Dictionary with the format version, (node_id, data) pairs and
+            (source_id, target_id, edge_type) triples
+        """
+        return {
+            "version": _GRAPH_FORMAT_VERSION,
+            "nodes": list(self._graph.nodes(data=True)),
+            "edges": [
+                (source, target, edge_type)
+                for source, target, edge_type in self._graph.edges(data="type")
+            ],
+        }
+
+    @staticmethod
+    def _from_state(state: dict[str, Any]) -> nx.DiGraph:
+        """Rebuild a graph from the lists produced by _to_state.
+
+        Args:
+            state: Unpickled graph state
+
+        Returns:
+            The reconstructed graph
+        """
+        if state.get("version") != _GRAPH_FORMAT_VERSION:
+            raise ValueError(f"Unsupported graph format version: {state.get('version')}")
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(state["nodes"])
+        graph.add_edges_from(
+            (source, target, {"type": edge_type}) for source, target, edge_type in state["edges"]
+        )
+        return graph
 
     def load(self) -> bool:
         """Load the graph from disk.
@@ -299,15 +636,52 @@ class GraphStorage:
         Returns:
             True if loaded successfully, False otherwise
         """
-        if not self._persist_path or not self._persist_path.exists():
+        if not self._persist_path:
+            return False
+        has_wal = self._wal_path is not None and self._wal_path.exists()
+        if not self._persist_path.exists() and not has_wal:
             return False
 
         try:
-            with open(self._persist_path, "rb") as f:
-                self._graph = pickle.load(f)
+            self._invalidate_caches()
+            if self._persist_path.exists():
+                with open(self._persist_path, "rb") as f:
+                    state = pickle.load(f)
+                # Graphs saved before the flat format are pickled DiGraphs
+                self._graph = state if isinstance(state, nx.DiGraph) else self._from_state(state)
+            else:
+                self._graph = nx.DiGraph()
+            if has_wal and not self._replay_wal():
+                # Later appends would land behind the damaged entry; start afresh
+                self.save()
             logger.info(f"Graph loaded from {self._persist_path}")
             return True
         except Exception as e:
             logger.error(f"Failed to load graph: {e}")
             self._graph = nx.DiGraph()
             return False
+
+    def _replay_wal(self) -> bool:
+        """Apply the mutations logged since the last save.
+
+        Returns:
+            True if the whole log was read, False if it ended in a damaged entry
+        """
+        assert self._wal_path is not None
+        frames = 0
+        complete = True
+        with open(self._wal_path, "rb") as f:
+            while True:
+                try:
+                    ops = pickle.load(f)
+                except EOFError:
+                    break
+                except Exception as e:
+                    # A write interrupted by a crash leaves a partial last frame
+                    logger.warning(f"Ignoring truncated graph log entry: {e}")
+                    complete = False
+                    break
+                self._apply_ops(ops)
+                frames += 1
+        logger.info(f"Replayed {frames} graph log entries from {self._wal_path}")
+        return complete
@@ -1,5 +1,6 @@
 """Parser module for extracting code entities using Tree-sitter."""
 
+from .cache import ParseCache
 from .entities import (
     AccessModifier,
     AnyEntity,
@@ -11,6 +12,7 @@ from .entities import (
     EntityType,
     File,
     Function,
+    ParseResult,
     TypeDefinition,
     TypeParameter,
 )
@@ -21,9 +23,10 @@ from .languages import (
     get_language_config,
     get_language_for_file,
     is_supported_file,
+    should_ignore_name,
     should_ignore_path,
 )
-from .treesitter import TreeSitterParser
+from .treesitter import TreeSitterParser, init_parse_worker, parse_file_in_worker
 
 __all__ = [
     # Entities
@@ -37,6 +40,7 @@ __all__ = [
     "EntityType",
     "File",
     "Function",
+    "ParseResult",
     "TypeDefinition",
     "TypeParameter",
     # Languages
@@ -46,7 +50,11 @@ __all__ = [
     "get_language_config",
     "get_language_for_file",
     "is_supported_file",
+    "should_ignore_name",
     "should_ignore_path",
     # Parser
+    "ParseCache",
     "TreeSitterParser",
+    "init_parse_worker",
+    "parse_file_in_worker",
 ]
@@ -0,0 +1,109 @@
+"""Persistent cache of parse results keyed by file path and content hash."""
+
+import hashlib
+import logging
+import pickle
+import sqlite3
+import threading
+from functools import cache
+from pathlib import Path
+
+from .entities import AnyEntity
+
+logger = logging.getLogger(__name__)
+
+# Modules whose code determines the extracted entities
+_PARSER_MODULES = ("entities.py", "languages.py", "treesitter.py")
+
+
+@cache
+def _parser_fingerprint() -> str:
+    """Hash the parser's own source, so edits to the extraction invalidate the cache.
+
+    Returns:
+        Hex digest of the parser modules
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for module in _PARSER_MODULES:
+        digest.update((Path(__file__).parent / module).read_bytes())
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Cache the entities of parsed files across server restarts.
+
+    Indexing a repository whose files did not change since the last run loads
+    their entities instead of parsing them again. Only the latest content of
+    each path is kept.
+    """
+
+    def __init__(self, db_path: Path, repo_name: str):
+        """Initialize the cache.
+
+        Args:
+            db_path: Path of the SQLite database file
+            repo_name: Name of the repository; entities are only returned to
+                parsers of the same repository name and parser code
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._namespace = f"{repo_name}:{_parser_fingerprint()}"
+        self._lock = threading.Lock()
+        # Pool worker processes write to the same database; WAL lets readers
+        # proceed while one of them writes
+        self._conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            "path TEXT NOT NULL, namespace TEXT NOT NULL, hash BLOB NOT NULL, "
+            "entities BLOB NOT NULL, PRIMARY KEY (path, namespace))"
+        )
+        # Entries of an older parser or another repository name can never hit again
+        self._conn.execute("DELETE FROM parse_cache WHERE namespace != ?", (self._namespace,))
+        self._conn.commit()
+        logger.debug(f"Parse cache at {db_path}")
+
+    def get(self, path: str, content_hash: bytes) -> list[AnyEntity] | None:
+        """Look up the entities of a file.
+
+        Args:
+            path: Relative path of the file
+            content_hash: Hash of the file content
+
+        Returns:
+            The cached entities, or None if the file is not cached with this content
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entities FROM parse_cache WHERE path = ? AND namespace = ? AND hash = ?",
+                (path, self._namespace, content_hash),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Discarding unreadable parse cache entry for {path}: {e}")
+            return None
+
+    def put(self, path: str, content_hash: bytes, entities: list[AnyEntity]) -> None:
+        """Store the entities of a file, replacing those of its previous content.
+
+        Args:
+            path: Relative path of the file
+            content_hash: Hash of the file content
+            entities: Entities extracted from the file
+        """
+        blob = pickle.dumps(entities, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (path, namespace, hash, entities) "
+                "VALUES (?, ?, ?, ?)",
+                (path, self._namespace, content_hash, blob),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,8 @@
 """Pydantic models for code entities extracted from source files."""
 
 import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Literal
 
@@ -278,3 +280,47 @@ EmbeddableEntity = Function | Class | TypeDefinition
 
 # Type alias for any code entity
 AnyEntity = Function | Class | File | TypeDefinition
+
+
+@dataclass(slots=True)
+class ParseResult:
+    """Entities of a parse grouped by kind, in their original order.
+
+    The by-name mappings hold the first function or class of each name.
+    """
+
+    functions: list[Function] = field(default_factory=list)
+    classes: list[Class] = field(default_factory=list)
+    types: list[TypeDefinition] = field(default_factory=list)
+    files: list[File] = field(default_factory=list)
+    functions_by_name: dict[str, Function] = field(default_factory=dict)
+    classes_by_name: dict[str, Class] = field(default_factory=dict)
+
+    @classmethod
+    def from_entities(cls, entities: Iterable[AnyEntity]) -> "ParseResult":
+        """Group entities by kind and index functions and classes by name in a single pass.
+
+        Args:
+            entities: Entities as returned by the parser
+
+        Returns:
+            The grouped entities
+        """
+        result = cls()
+        buckets: dict[type, list] = {
+            Function: result.functions,
+            Class: result.classes,
+            TypeDefinition: result.types,
+            File: result.files,
+        }
+        by_name: dict[type, dict] = {
+            Function: result.functions_by_name,
+            Class: result.classes_by_name,
+        }
+        for entity in entities:
+            entity_type = type(entity)
+            buckets[entity_type].append(entity)
+            names = by_name.get(entity_type)
+            if names is not None:
+                names.setdefault(entity.name, entity)
+        return result
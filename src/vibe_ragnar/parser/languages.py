@@ -1,5 +1,6 @@
 """Language configurations for Tree-sitter parsing."""
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -29,6 +30,9 @@ class LanguageConfig:
     call_query: str
     # Optional: type definition query (for TypeScript, Go)
     type_query: str | None = None
+    # Keywords at least one of which must appear in a file that defines any
+    # function, class or type. Empty means definitions can't be ruled out cheaply.
+    definition_tokens: tuple[bytes, ...] = ()
 
 
 # Tree-sitter query patterns for Python
@@ -659,6 +663,7 @@ def _create_language_configs() -> dict[str, LanguageConfig]:
             class_query=PYTHON_CLASS_QUERY,
             import_query=PYTHON_IMPORT_QUERY,
             call_query=PYTHON_CALL_QUERY,
+            definition_tokens=(b"def", b"class"),
         ),
         "typescript": LanguageConfig(
             name="typescript",
@@ -688,6 +693,7 @@ def _create_language_configs() -> dict[str, LanguageConfig]:
             import_query=GO_IMPORT_QUERY,
             call_query=GO_CALL_QUERY,
             type_query=GO_TYPE_QUERY,
+            definition_tokens=(b"func", b"type"),
         ),
         "rust": LanguageConfig(
             name="rust",
@@ -698,6 +704,7 @@ def _create_language_configs() -> dict[str, LanguageConfig]:
             import_query=RUST_IMPORT_QUERY,
             call_query=RUST_CALL_QUERY,
             type_query=RUST_TYPE_QUERY,
+            definition_tokens=(b"fn", b"struct", b"impl", b"enum", b"type"),
         ),
         "java": LanguageConfig(
             name="java",
@@ -707,6 +714,7 @@ def _create_language_configs() -> dict[str, LanguageConfig]:
             class_query=JAVA_CLASS_QUERY,
             import_query=JAVA_IMPORT_QUERY,
             call_query=JAVA_CALL_QUERY,
+            definition_tokens=(b"class", b"interface", b"enum", b"record"),
         ),
         "c": LanguageConfig(
             name="c",
@@ -748,6 +756,9 @@ for lang_name, config in LANGUAGE_CONFIGS.items():
     for ext in config.extensions:
         EXTENSION_TO_LANGUAGE[ext] = lang_name
 
+# Supported extensions for str.endswith, which rejects most files in one C call
+_SUPPORTED_SUFFIXES = tuple(EXTENSION_TO_LANGUAGE)
+
 
 def get_language_for_file(file_path: Path | str) -> str | None:
     """Get the language name for a file based on its extension.
@@ -758,8 +769,8 @@ def get_language_for_file(file_path: Path | str) -> str | None:
     Returns:
         Language name or None if not supported
     """
-    path = Path(file_path)
-    ext = path.suffix.lower()
+    # splitext on the string avoids building a Path for every watched or scanned file
+    ext = os.path.splitext(file_path)[1].lower()
     return EXTENSION_TO_LANGUAGE.get(ext)
 
 
@@ -784,6 +795,9 @@ def is_supported_file(file_path: Path | str) -> bool:
     Returns:
         True if the file extension is supported
     """
+    if not os.fspath(file_path).lower().endswith(_SUPPORTED_SUFFIXES):
+        return False
+    # A name that is only the extension (".py") has none according to splitext
     return get_language_for_file(file_path) is not None
 
 
@@ -904,6 +918,25 @@ IGNORED_DIRECTORIES = frozenset({
 })
 
 
+def should_ignore_name(name: str, include_dirs: frozenset[str] | None = None) -> bool:
+    """Check if a single path component should be ignored during scanning.
+
+    Args:
+        name: File or directory name
+        include_dirs: Set of directory names to force include even if in ignore list
+
+    Returns:
+        True if the name should be ignored
+    """
+    # Skip ignored check if directory is in force-include list
+    if include_dirs and name in include_dirs:
+        return False
+    if name in IGNORED_DIRECTORIES:
+        return True
+    # Also ignore hidden directories (except .github, etc.)
+    return name.startswith(".") and name not in {".github", ".gitlab"}
+
+
 def should_ignore_path(path: Path, include_dirs: frozenset[str] | None = None) -> bool:
     """Check if a path should be ignored during scanning.
 
@@ -914,16 +947,5 @@ def should_ignore_path(path: Path, include_dirs: frozenset[str] | None = None) -
     Returns:
         True if the path should be ignored
     """
-    include_dirs = include_dirs or frozenset()
-
     # Check if any part of the path is in the ignored set
-    for part in path.parts:
-        # Skip ignored check if directory is in force-include list
-        if part in include_dirs:
-            continue
-        if part in IGNORED_DIRECTORIES:
-            return True
-        # Also ignore hidden directories (except .github, etc.)
-        if part.startswith(".") and part not in {".github", ".gitlab"}:
-            return True
-    return False
+    return any(should_ignore_name(part, include_dirs) for part in path.parts)
@@ -1,11 +1,20 @@
 """Tree-sitter parser for extracting code entities from source files."""
 
+import hashlib
 import logging
+import os
 import re
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import cache, partial
 from pathlib import Path
 
-from tree_sitter import Language, Node, Parser, Query, QueryCursor
+from tree_sitter import Node, Parser, Query, QueryCursor, Tree
 
+from .cache import ParseCache
 from .entities import (
     AccessModifier,
     AnyEntity,
@@ -23,43 +32,243 @@ from .languages import (
     get_language_config,
     get_language_for_file,
     is_supported_file,
-    should_ignore_path,
+    should_ignore_name,
 )
 
 logger = logging.getLogger(__name__)
 
+# Capture names in import queries that hold an imported module/path
+_IMPORT_CAPTURES = frozenset({"import.name", "import.module", "import.path", "import.source"})
+
+# Number of (path, content) parse results kept per parser
+_PARSE_CACHE_SIZE = 512
+
+# Number of recently parsed files whose syntax trees are kept for incremental
+# re-parsing, and the block size used to find the changed byte range
+_TREE_CACHE_SIZE = 64
+_DIFF_BLOCK_SIZE = 1024
+
+# Node types of calls, and of the argument lists inside them
+_CALL_NODE_TYPES = frozenset({"call_expression", "call", "method_invocation"})
+_ARGUMENT_NODE_TYPES = frozenset({"arguments", "argument_list", "formal_parameters"})
+
+
+class _AsciiSource(bytes):
+    """Source bytes of an ASCII-only file, carrying its decoded text.
+
+    For ASCII input byte offsets equal character offsets, so node text can be
+    sliced from the decoded string instead of decoding every node separately.
+    """
+
+    text: str
+
+
+def _intern_all(names: list[str]) -> list[str]:
+    """Intern identifier strings that repeat across many entities.
+
+    Call targets, decorators, bases and imports are mostly the same few
+    names throughout a repository; interning them stores one copy each for
+    all entities (and graph nodes) that reference them.
+
+    Args:
+        names: Identifiers extracted from the source
+
+    Returns:
+        The interned identifiers, in the same order
+    """
+    return [sys.intern(name) for name in names]
+
+
+def _common_prefix_length(old: bytes, new: bytes) -> int:
+    """Count the leading bytes two sources have in common.
+
+    Equal blocks are skipped with C-level slice comparisons; only the block
+    holding the first difference is scanned byte by byte.
+
+    Args:
+        old: Previous source
+        new: Current source
+
+    Returns:
+        Length of the common prefix
+    """
+    limit = min(len(old), len(new))
+    length = 0
+    while (
+        length + _DIFF_BLOCK_SIZE <= limit
+        and old[length : length + _DIFF_BLOCK_SIZE] == new[length : length + _DIFF_BLOCK_SIZE]
+    ):
+        length += _DIFF_BLOCK_SIZE
+    while length < limit and old[length] == new[length]:
+        length += 1
+    return length
+
+
+def _common_suffix_length(old: bytes, new: bytes, limit: int) -> int:
+    """Count the trailing bytes two sources have in common.
+
+    Args:
+        old: Previous source
+        new: Current source
+        limit: Maximum length to report (so the suffix doesn't overlap the prefix)
+
+    Returns:
+        Length of the common suffix
+    """
+    old_end, new_end = len(old), len(new)
+    length = 0
+    while (
+        length + _DIFF_BLOCK_SIZE <= limit
+        and old[old_end - length - _DIFF_BLOCK_SIZE : old_end - length]
+        == new[new_end - length - _DIFF_BLOCK_SIZE : new_end - length]
+    ):
+        length += _DIFF_BLOCK_SIZE
+    while length < limit and old[old_end - length - 1] == new[new_end - length - 1]:
+        length += 1
+    return length
+
+
+def _point_at(source: bytes, offset: int) -> tuple[int, int]:
+    """Convert a byte offset into a tree-sitter (row, column) point.
+
+    Args:
+        source: Source code
+        offset: Byte offset into the source
+
+    Returns:
+        Zero-based row and byte column of the offset
+    """
+    row = source.count(b"\n", 0, offset)
+    column = offset - (source.rfind(b"\n", 0, offset) + 1)
+    return row, column
+
+
+def _edit_tree(tree: Tree, old: bytes, new: bytes) -> None:
+    """Record the change from old to new source on the old source's tree.
+
+    The change is described as one edit spanning from the first to the last
+    differing byte, which lets tree-sitter reuse every subtree outside it.
+
+    Args:
+        tree: Tree parsed from old
+        old: Previous source
+        new: Current source
+    """
+    start = _common_prefix_length(old, new)
+    suffix = _common_suffix_length(old, new, min(len(old), len(new)) - start)
+    old_end = len(old) - suffix
+    new_end = len(new) - suffix
+    tree.edit(
+        start_byte=start,
+        old_end_byte=old_end,
+        new_end_byte=new_end,
+        start_point=_point_at(old, start),
+        old_end_point=_point_at(old, old_end),
+        new_end_point=_point_at(new, new_end),
+    )
+
+
+def _prepare_source(source: bytes) -> bytes:
+    """Wrap ASCII-only source so node text lookups can skip decoding.
+
+    Args:
+        source: Raw file contents
+
+    Returns:
+        The source, as an _AsciiSource when it contains only ASCII bytes
+    """
+    if not source.isascii():
+        return source
+    prepared = _AsciiSource(source)
+    prepared.text = source.decode("ascii")
+    return prepared
+
+
+@cache
+def _get_queries(language: str) -> dict[str, Query]:
+    """Compile the queries for a language, once per process.
+
+    Compiled queries are immutable and shared by all parser instances and
+    threads; each query run uses its own QueryCursor.
+
+    Args:
+        language: Language name
+
+    Returns:
+        Dictionary mapping query kind ("function", "class", ...) to its query
+    """
+    config = LANGUAGE_CONFIGS[language]
+    queries = {
+        "function": Query(config.language, config.function_query),
+        "class": Query(config.language, config.class_query),
+        "import": Query(config.language, config.import_query),
+        "call": Query(config.language, config.call_query),
+    }
+    if config.type_query:
+        queries["type"] = Query(config.language, config.type_query)
+    return queries
+
+
+@cache
+def _get_import_captures(language: str) -> tuple[str, ...]:
+    """Get the capture names of a language's import query that hold imports.
+
+    Args:
+        language: Language name
+
+    Returns:
+        Import capture names, in the order the query declares them
+    """
+    query = _get_queries(language)["import"]
+    capture_names = (query.capture_name(i) for i in range(query.capture_count))
+    return tuple(name for name in capture_names if name in _IMPORT_CAPTURES)
+
 
 class TreeSitterParser:
     """Parser for extracting code entities using Tree-sitter."""
 
-    def __init__(self, repo_name: str):
+    def __init__(self, repo_name: str, cache: ParseCache | None = None):
         """Initialize the parser.
 
         Args:
             repo_name: Name of the repository (used in entity IDs)
+            cache: Optional persistent cache of parse results shared across runs
         """
         self.repo_name = repo_name
-        self._parsers: dict[str, Parser] = {}
-        self._queries: dict[str, dict[str, Query]] = {}
-        self._languages: dict[str, Language] = {}
-        self._init_parsers()
-
-    def _init_parsers(self) -> None:
-        """Initialize Tree-sitter parsers and queries for all languages."""
-        for lang_name, config in LANGUAGE_CONFIGS.items():
-            parser = Parser(config.language)
-            self._parsers[lang_name] = parser
-            self._languages[lang_name] = config.language
-
-            # Pre-compile queries
-            self._queries[lang_name] = {
-                "function": Query(config.language, config.function_query),
-                "class": Query(config.language, config.class_query),
-                "import": Query(config.language, config.import_query),
-                "call": Query(config.language, config.call_query),
-            }
-            if config.type_query:
-                self._queries[lang_name]["type"] = Query(config.language, config.type_query)
+        self._cache = cache
+        self._local = threading.local()
+        # (relative path, content digest) -> entities, least recently used first
+        self._parse_cache: OrderedDict[tuple[str, bytes], list[AnyEntity]] = OrderedDict()
+        # relative path -> (source, tree) of recently parsed files, least recently
+        # used first; both caches are guarded by the lock
+        self._trees: OrderedDict[str, tuple[bytes, Tree]] = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
+
+    def _get_parser(self, language: str) -> Parser:
+        """Get the calling thread's parser for a language.
+
+        Parsers are not safe to share between threads, so each thread keeps
+        its own per-language parser and reuses it across files.
+
+        Args:
+            language: Language name
+
+        Returns:
+            Parser reset and ready for a new parse
+        """
+        parsers: dict[str, Parser] | None = getattr(self._local, "parsers", None)
+        if parsers is None:
+            parsers = {}
+            self._local.parsers = parsers
+
+        parser = parsers.get(language)
+        if parser is None:
+            parser = Parser(LANGUAGE_CONFIGS[language].language)
+            parsers[language] = parser
+        else:
+            # Release state left over from the previous file deterministically
+            parser.reset()
+        return parser
 
     def _run_query(self, query: Query, node: Node) -> dict[str, list[Node]]:
         """Run a query and return captures as a dictionary.
@@ -69,10 +278,29 @@ class TreeSitterParser:
             node: The root node to search
 
         Returns:
-            Dictionary mapping capture names to lists of matching nodes
+            Dictionary mapping capture names to lists of matching nodes, each
+            list in document order
+        """
+        cursor = QueryCursor(query)
+        captures = cursor.captures(node)
+        # The cursor does not return nodes in a stable order; sort them so
+        # call lists and first-occurrence lines are the same on every parse
+        for nodes in captures.values():
+            nodes.sort(key=lambda n: (n.start_byte, n.end_byte))
+        return captures
+
+    def _run_matches(self, query: Query, node: Node) -> list[tuple[int, dict[str, list[Node]]]]:
+        """Run a query and return its matches.
+
+        Args:
+            query: The compiled query
+            node: The root node to search
+
+        Returns:
+            List of (pattern index, captures) tuples, one per match
         """
         cursor = QueryCursor(query)
-        return cursor.captures(node)
+        return cursor.matches(node)
 
     def supports_file(self, file_path: Path | str) -> bool:
         """Check if a file is supported for parsing.
@@ -96,10 +324,6 @@ class TreeSitterParser:
             List of extracted code entities
         """
         file_path = Path(file_path)
-        if not file_path.exists():
-            logger.warning(f"File does not exist: {file_path}")
-            return []
-
         language = get_language_for_file(file_path)
         if not language:
             logger.debug(f"Unsupported file type: {file_path}")
@@ -109,8 +333,12 @@ class TreeSitterParser:
         if not config:
             return []
 
+        # Reading without a prior exists() check saves a stat per file
         try:
             source = file_path.read_bytes()
+        except FileNotFoundError:
+            logger.warning(f"File does not exist: {file_path}")
+            return []
         except OSError as e:
             logger.error(f"Failed to read file {file_path}: {e}")
             return []
@@ -124,35 +352,177 @@ class TreeSitterParser:
         else:
             relative_path = str(file_path)
 
-        # Parse the file
-        parser = self._parsers[language]
-        tree = parser.parse(source)
+        return self._parse(source, relative_path, file_path.name, language, config)
+
+    def parse_source(self, source: str | bytes, file_path: Path | str) -> list[AnyEntity]:
+        """Parse in-memory source code as if it were the contents of a file.
+
+        Args:
+            source: Source code
+            file_path: Path reported in the entities; its extension selects the
+                language
+
+        Returns:
+            List of extracted code entities (empty for unsupported file types)
+        """
+        file_path = Path(file_path)
+        language = get_language_for_file(file_path)
+        if not language:
+            logger.debug(f"Unsupported file type: {file_path}")
+            return []
+
+        config = get_language_config(language)
+        if not config:
+            return []
+
+        if isinstance(source, str):
+            source = source.encode()
+        return self._parse(source, str(file_path), file_path.name, language, config)
+
+    def extract_imports(self, source: str | bytes, file_path: Path | str) -> list[str]:
+        """Extract only the imports of source code, skipping entity extraction.
+
+        Runs just the import query, for callers such as dependency scans that
+        need a file's imports but none of its definitions.
+
+        Args:
+            source: Source code
+            file_path: Path of the file; its extension selects the language
+
+        Returns:
+            Imported modules/paths in source order, as in File.imports (empty
+            for unsupported file types)
+        """
+        language = get_language_for_file(file_path)
+        if not language:
+            return []
+
+        if isinstance(source, str):
+            source = source.encode()
+        tree = self._get_parser(language).parse(source)
+        imports = self._extract_imports(tree.root_node, _prepare_source(source), language)
+        return _intern_all(imports)
+
+    def _parse(
+        self,
+        source: bytes,
+        relative_path: str,
+        file_name: str,
+        language: str,
+        config: LanguageConfig,
+    ) -> list[AnyEntity]:
+        """Parse source code and extract its entities.
+
+        Results are cached by path and content, so re-parsing an unchanged file
+        (a save without edits, a reindex) skips Tree-sitter entirely. With a
+        persistent cache this also holds for files unchanged since the last run.
+
+        Args:
+            source: Raw source code
+            relative_path: File path used in entity IDs
+            file_name: Name of the file
+            language: Language name
+            config: Configuration of the language
+
+        Returns:
+            List of extracted code entities, ending with the file entity
+        """
+        # Same digest as entity content_hash
+        content_hash = hashlib.sha256(source).digest()
+        key = (relative_path, content_hash)
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(key)
+            if cached is not None:
+                self._parse_cache.move_to_end(key)
+                return list(cached)
+
+        entities = None
+        if self._cache is not None:
+            entities = self._cache.get(relative_path, content_hash)
+        if entities is None:
+            entities = self._extract_entities(source, relative_path, file_name, language, config)
+            if self._cache is not None:
+                self._cache.put(relative_path, content_hash, entities)
+
+        with self._parse_cache_lock:
+            self._parse_cache[key] = entities
+            if len(self._parse_cache) > _PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        return list(entities)
+
+    def _extract_entities(
+        self,
+        source: bytes,
+        relative_path: str,
+        file_name: str,
+        language: str,
+        config: LanguageConfig,
+    ) -> list[AnyEntity]:
+        """Parse source code with Tree-sitter and extract its entities.
+
+        When the file was parsed recently, its previous tree is edited to the
+        changed byte range and passed to tree-sitter, which then re-parses only
+        the edited region instead of the whole file.
+
+        Args:
+            source: Raw source code
+            relative_path: File path used in entity IDs
+            file_name: Name of the file
+            language: Language name
+            config: Configuration of the language
+
+        Returns:
+            List of extracted code entities, ending with the file entity
+        """
+        parser = self._get_parser(language)
+        # Taking the tree out of the cache gives this thread sole use of it
+        with self._parse_cache_lock:
+            previous = self._trees.pop(relative_path, None)
+        if previous is None:
+            tree = parser.parse(source)
+        else:
+            old_source, old_tree = previous
+            _edit_tree(old_tree, old_source, source)
+            tree = parser.parse(source, old_tree)
+        with self._parse_cache_lock:
+            self._trees[relative_path] = (source, tree)
+            if len(self._trees) > _TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+
+        source = _prepare_source(source)
 
         entities: list[AnyEntity] = []
 
-        # Extract functions
-        functions = self._extract_functions(tree.root_node, source, relative_path, language, config)
-        entities.extend(functions)
+        # Files without any definition keyword can't match the definition
+        # queries, so skip walking their AST with them
+        if not config.definition_tokens or any(
+            token in source for token in config.definition_tokens
+        ):
+            # Extract functions
+            functions = self._extract_functions(
+                tree.root_node, source, relative_path, language, config
+            )
+            entities.extend(functions)
 
-        # Extract classes
-        classes = self._extract_classes(tree.root_node, source, relative_path, language, config)
-        entities.extend(classes)
+            # Extract classes
+            classes = self._extract_classes(tree.root_node, source, relative_path, language, config)
+            entities.extend(classes)
 
-        # Extract type definitions (TypeScript, Go, Rust)
-        if language in {"typescript", "go", "rust"}:
-            types = self._extract_types(tree.root_node, source, relative_path, language, config)
-            entities.extend(types)
+            # Extract type definitions (TypeScript, Go, Rust)
+            if language in {"typescript", "go", "rust"}:
+                types = self._extract_types(tree.root_node, source, relative_path, language, config)
+                entities.extend(types)
 
         # Create file entity
         imports = self._extract_imports(tree.root_node, source, language)
         file_entity = File(
             repo=self.repo_name,
             file_path=relative_path,
-            name=file_path.name,
+            name=file_name,
             start_line=1,
             end_line=source.count(b"\n") + 1,
             language=language,
-            imports=imports,
+            imports=_intern_all(imports),
             defines=[e.id for e in entities],
         )
         entities.append(file_entity)
@@ -169,30 +539,26 @@ class TreeSitterParser:
     ) -> list[Function]:
         """Extract function definitions from the AST."""
         functions: list[Function] = []
-        query = self._queries[language]["function"]
-        call_query = self._queries[language]["call"]
+        query = _get_queries(language)["function"]
+        call_query = _get_queries(language)["call"]
 
-        captures = self._run_query(query, root)
+        # Each match pairs a definition with the name captured by the same pattern.
+        # A definition can match several patterns (e.g. decorated functions), so
+        # keep only its first match.
+        seen_defs: set[tuple[int, int]] = set()
 
-        # Get function definitions
-        func_defs = captures.get("function.def", [])
-        func_names = captures.get("function.name", [])
-
-        # Match names to definitions by position
-        name_to_node: dict[tuple[int, int], Node] = {}
-        for name_node in func_names:
-            name_to_node[(name_node.start_byte, name_node.end_byte)] = name_node
-
-        for def_node in func_defs:
-            # Find the name node within this definition
-            func_name = None
-            name_node = None
-            for child in self._walk_children(def_node):
-                key = (child.start_byte, child.end_byte)
-                if key in name_to_node:
-                    name_node = name_to_node[key]
-                    func_name = self._node_text(name_node, source)
-                    break
+        for _, match_captures in self._run_matches(query, root):
+            def_nodes = match_captures.get("function.def")
+            if not def_nodes:
+                continue
+            def_node = def_nodes[0]
+            def_key = (def_node.start_byte, def_node.end_byte)
+            if def_key in seen_defs:
+                continue
+            seen_defs.add(def_key)
+
+            name_nodes = match_captures.get("function.name")
+            func_name = self._node_text(name_nodes[0], source) if name_nodes else None
 
             if not func_name:
                 # Fallback: look for identifier/property_identifier directly
@@ -256,9 +622,9 @@ class TreeSitterParser:
                 signature=signature,
                 docstring=docstring,
                 code=func_code,
-                class_name=class_name,
-                decorators=decorators,
-                calls=calls,
+                class_name=sys.intern(class_name) if class_name else class_name,
+                decorators=_intern_all(decorators),
+                calls=_intern_all(calls),
                 call_details=call_details,
                 is_async=is_async,
                 is_constructor=is_constructor,
@@ -282,7 +648,7 @@ class TreeSitterParser:
     ) -> list[Class]:
         """Extract class definitions from the AST."""
         classes: list[Class] = []
-        query = self._queries[language]["class"]
+        query = _get_queries(language)["class"]
 
         captures = self._run_query(query, root)
 
@@ -329,8 +695,8 @@ class TreeSitterParser:
                 end_line=def_node.end_point[0] + 1,
                 docstring=docstring,
                 code=class_code,
-                bases=bases,
-                decorators=decorators,
+                bases=_intern_all(bases),
+                decorators=_intern_all(decorators),
                 methods=methods,
                 access_modifier=access_modifier,
                 is_abstract=is_abstract,
@@ -353,10 +719,10 @@ class TreeSitterParser:
         """Extract type/interface definitions (TypeScript, Go, Rust)."""
         types: list[TypeDefinition] = []
 
-        if "type" not in self._queries[language]:
+        if "type" not in _get_queries(language):
             return types
 
-        query = self._queries[language]["type"]
+        query = _get_queries(language)["type"]
         captures = self._run_query(query, root)
 
         type_defs = captures.get("type.def", [])
@@ -390,32 +756,38 @@ class TreeSitterParser:
         return types
 
     def _extract_imports(self, root: Node, source: bytes, language: str) -> list[str]:
-        """Extract import statements from the AST."""
-        imports: list[str] = []
-        query = self._queries[language]["import"]
+        """Extract import statements from the AST.
+
+        Imports are deduplicated and returned in source order, so re-indexing an
+        unchanged file yields identical File entities.
+        """
+        query = _get_queries(language)["import"]
 
         captures = self._run_query(query, root)
 
-        for key in ["import.name", "import.module", "import.path", "import.source"]:
-            for node in captures.get(key, []):
-                import_text = self._node_text(node, source)
-                # Clean up the import text
-                import_text = import_text.strip("'\"")
-                if import_text:
-                    imports.append(import_text)
+        import_nodes = [
+            node for name in _get_import_captures(language) for node in captures.get(name, ())
+        ]
+        import_nodes.sort(key=lambda node: node.start_byte)
 
-        return list(set(imports))  # Deduplicate
+        imports: dict[str, None] = {}
+        for node in import_nodes:
+            import_text = self._node_text(node, source)
+            # String literal paths (JS/TS, Go, Dart) keep their quotes
+            quote = import_text[:1]
+            if quote in ("'", '"') and len(import_text) >= 2 and import_text.endswith(quote):
+                import_text = import_text[1:-1]
+            if import_text:
+                imports[import_text] = None
 
-    def _walk_children(self, node: Node):
-        """Recursively yield all children of a node."""
-        yield node
-        for child in node.children:
-            yield from self._walk_children(child)
+        return list(imports)
 
     def _node_text(self, node: Node | None, source: bytes) -> str:
         """Get the text content of a node."""
         if node is None:
             return ""
+        if isinstance(source, _AsciiSource):
+            return source.text[node.start_byte : node.end_byte]
         return source[node.start_byte : node.end_byte].decode("utf-8", errors="replace")
 
     def _find_function_name(self, node: Node, source: bytes, language: str) -> str | None:
@@ -804,24 +1176,51 @@ class TreeSitterParser:
 
         return bases
 
+    _METHOD_NODE_TYPES = frozenset(
+        {"function_definition", "method_definition", "method_declaration", "function_item"}
+    )
+    # Wrappers that may sit between a class body and a method definition
+    _METHOD_WRAPPER_TYPES = frozenset({"decorated_definition", "template_declaration"})
+    # Conditional statements of a class body whose blocks may define methods
+    _METHOD_BLOCK_TYPES = frozenset(
+        {
+            "if_statement",
+            "elif_clause",
+            "else_clause",
+            "try_statement",
+            "except_clause",
+            "except_group_clause",
+            "finally_clause",
+            "block",
+        }
+    )
+
     def _extract_method_names(self, node: Node, source: bytes, language: str) -> list[str]:
-        """Extract method names from a class body."""
+        """Extract method names from a class body.
+
+        Members of the body are inspected along with those of if/try blocks
+        directly inside it, so conditionally defined methods are found while
+        function bodies and nested classes are never traversed.
+        """
+        body = node.child_by_field_name("body") or node
         methods: list[str] = []
 
-        def find_methods(n: Node) -> None:
-            if n.type in {
-                "function_definition",
-                "method_definition",
-                "method_declaration",
-                "function_item",
-            }:
-                name = self._find_function_name(n, source, language)
+        stack = list(reversed(body.named_children))
+        while stack:
+            child = stack.pop()
+            if child.type in self._METHOD_BLOCK_TYPES:
+                stack.extend(reversed(child.named_children))
+                continue
+            if child.type in self._METHOD_WRAPPER_TYPES:
+                child = next(
+                    (c for c in child.named_children if c.type in self._METHOD_NODE_TYPES),
+                    child,
+                )
+            if child.type in self._METHOD_NODE_TYPES:
+                name = self._find_function_name(child, source, language)
                 if name:
                     methods.append(name)
-            for child in n.children:
-                find_methods(child)
 
-        find_methods(node)
         return methods
 
     def _determine_type_kind(self, node: Node, language: str) -> str:
@@ -863,7 +1262,7 @@ class TreeSitterParser:
         if language == "dart":
             return self._extract_dart_calls(body_node, source)
 
-        call_query = self._queries[language]["call"]
+        call_query = _get_queries(language)["call"]
         call_captures = self._run_query(call_query, body_node)
 
         calls: list[str] = []
@@ -1141,20 +1540,18 @@ class TreeSitterParser:
         return None
 
     def _is_nested_call(self, node: Node) -> bool:
-        """Check if a call is nested inside another call's arguments."""
+        """Check if a call is nested inside another call's arguments.
+
+        Walks up from the node, remembering which child of each ancestor the
+        walk came through, so no subtree has to be searched for the node.
+        """
+        child = node
         parent = node.parent
         while parent:
-            if parent.type in {
-                "call_expression",
-                "call",
-                "method_invocation",
-            }:
-                # Check if we're in the arguments, not the function position
-                for child in parent.children:
-                    if child.type in {"arguments", "argument_list", "formal_parameters"}:
-                        if self._node_contains(child, node):
-                            return True
-            parent = parent.parent
+            # In the arguments of an enclosing call, not its function position
+            if parent.type in _CALL_NODE_TYPES and child.type in _ARGUMENT_NODE_TYPES:
+                return True
+            child, parent = parent, parent.parent
         return False
 
     def _is_chained_call(self, node: Node) -> bool:
@@ -1169,15 +1566,6 @@ class TreeSitterParser:
             parent = parent.parent
         return False
 
-    def _node_contains(self, parent: Node, target: Node) -> bool:
-        """Check if parent node contains target node."""
-        if parent == target:
-            return True
-        for child in parent.children:
-            if self._node_contains(child, target):
-                return True
-        return False
-
     def _looks_like_constructor_call(self, name: str, language: str) -> bool:
         """Check if a function name looks like a constructor call."""
         if language == "go":
@@ -1523,30 +1911,176 @@ class TreeSitterParser:
         directory: Path,
         repo_root: Path | None = None,
         include_dirs: list[str] | None = None,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
     ) -> list[AnyEntity]:
         """Parse all supported files in a directory recursively.
 
+        By default files are parsed on a thread pool; tree-sitter releases the
+        GIL while parsing and each thread uses its own parsers. For full
+        parallelism pass a process pool initialized with init_parse_worker.
+
         Args:
             directory: Directory to parse
             repo_root: Root of the repository (defaults to directory)
             include_dirs: Directories to include even if normally ignored
+            max_workers: Number of parsing threads (defaults to the CPU count)
+            executor: Process pool whose workers ran init_parse_worker with this
+                parser's repo name; when given, max_workers is ignored
 
         Returns:
-            List of all extracted entities
+            List of all extracted entities, in file discovery order
         """
         if repo_root is None:
             repo_root = directory
 
         include_set = frozenset(include_dirs) if include_dirs else None
+        file_paths = list(self._iter_source_files(directory, include_set))
+
         all_entities: list[AnyEntity] = []
+        for entities in self.parse_files(file_paths, repo_root, max_workers, executor):
+            all_entities.extend(entities)
+        return all_entities
 
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and not should_ignore_path(file_path, include_set):
-                if self.supports_file(file_path):
-                    try:
-                        entities = self.parse_file(file_path, repo_root)
-                        all_entities.extend(entities)
-                    except Exception as e:
-                        logger.error(f"Failed to parse {file_path}: {e}")
+    def parse_files(
+        self,
+        file_paths: Iterable[Path],
+        repo_root: Path | None = None,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> list[list[AnyEntity]]:
+        """Parse several files concurrently.
 
-        return all_entities
+        Files are parsed on a thread pool unless a process pool is given, as
+        in parse_directory. A file that fails to parse yields no entities.
+
+        Args:
+            file_paths: Paths of the files to parse
+            repo_root: Root directory of the repository (for relative paths)
+            max_workers: Number of parsing threads (defaults to the CPU count)
+            executor: Process pool whose workers ran init_parse_worker with this
+                parser's repo name; when given, max_workers is ignored
+
+        Returns:
+            One list of entities per file, in the order of file_paths
+        """
+        if executor is not None:
+            file_paths = list(file_paths)
+            return list(
+                executor.map(
+                    partial(parse_file_in_worker, repo_root=repo_root),
+                    file_paths,
+                    chunksize=_worker_chunksize(len(file_paths)),
+                )
+            )
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        with ThreadPoolExecutor(max_workers=max_workers) as thread_pool:
+            return list(
+                thread_pool.map(partial(self._parse_file_logged, repo_root=repo_root), file_paths)
+            )
+
+    def _iter_source_files(
+        self, directory: Path, include_dirs: frozenset[str] | None
+    ) -> Iterator[Path]:
+        """Yield supported, non-ignored files below a directory.
+
+        Uses os.scandir so entry types come from the directory listing rather
+        than a stat per path, and prunes ignored directories without entering them.
+
+        Args:
+            directory: Directory to walk
+            include_dirs: Directory names to include even if normally ignored
+
+        Yields:
+            Paths of files that should be parsed
+        """
+        stack = [os.fspath(directory)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if should_ignore_name(entry.name, include_dirs):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file() and self.supports_file(entry.name):
+                            yield Path(entry.path)
+            except OSError as e:
+                logger.warning(f"Failed to scan directory {current}: {e}")
+
+    def _parse_file_logged(self, file_path: Path, repo_root: Path | None) -> list[AnyEntity]:
+        """Parse a file, logging and swallowing any parse failure.
+
+        Args:
+            file_path: Path to the file to parse
+            repo_root: Root directory of the repository
+
+        Returns:
+            Extracted entities, or an empty list if parsing failed
+        """
+        try:
+            return self.parse_file(file_path, repo_root)
+        except Exception as e:
+            logger.error(f"Failed to parse {file_path}: {e}")
+            return []
+
+
+# Maximum number of files handed to a process-pool worker per task
+_WORKER_CHUNKSIZE = 16
+
+
+def _worker_chunksize(file_count: int) -> int:
+    """Choose how many files to send to a process-pool worker per task.
+
+    Large batches use _WORKER_CHUNKSIZE to amortize inter-process overhead;
+    small ones are split into smaller chunks (about four per CPU) so they
+    still spread over all workers.
+
+    Args:
+        file_count: Number of files to parse
+
+    Returns:
+        Chunk size for Executor.map
+    """
+    return max(1, min(_WORKER_CHUNKSIZE, file_count // (4 * (os.cpu_count() or 1))))
+
+
+# Parser owned by the current process-pool worker (see init_parse_worker)
+_worker_parser: TreeSitterParser | None = None
+
+
+def init_parse_worker(repo_name: str, cache_path: Path | None = None) -> None:
+    """Initialize a process-pool worker for parse_file_in_worker.
+
+    Pass as the executor initializer so each worker process builds its parser
+    (and compiles its queries) once instead of once per file.
+
+    Args:
+        repo_name: Name of the repository (used in entity IDs)
+        cache_path: Optional database of the persistent parse cache (see ParseCache)
+    """
+    global _worker_parser
+    cache = ParseCache(cache_path, repo_name) if cache_path is not None else None
+    _worker_parser = TreeSitterParser(repo_name, cache=cache)
+
+
+def parse_file_in_worker(file_path: Path, repo_root: Path | None = None) -> list[AnyEntity]:
+    """Parse a file with the current worker's parser.
+
+    Failures are logged and yield no entities, so one bad file does not abort
+    a whole batch.
+
+    Args:
+        file_path: Path to the file to parse
+        repo_root: Root directory of the repository (for relative paths)
+
+    Returns:
+        Extracted entities, or an empty list if parsing failed
+    """
+    if _worker_parser is None:
+        raise RuntimeError("init_parse_worker() must run before parse_file_in_worker()")
+    return _worker_parser._parse_file_logged(file_path, repo_root)
@@ -1,7 +1,12 @@
 """FastMCP server for Vibe RAGnar - code indexing with graph analysis and semantic search."""
 
+import asyncio
 import logging
+import multiprocessing
+import os
 import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
@@ -11,12 +16,18 @@ from fastmcp import FastMCP
 from .config import Settings, setup_logging
 from .embeddings import ChromaDBStorage, EmbeddingGenerator, EmbeddingSync
 from .graph import GraphBuilder, GraphStorage
-from .parser import TreeSitterParser
+from .parser import AnyEntity, ParseCache, TreeSitterParser, init_parse_worker
 from .tools import register_all_tools
-from .watcher import FileWatcher
+from .watcher import FileChange, FileWatcher
 
 logger = logging.getLogger(__name__)
 
+# Threads used to parse the files of one batch of watcher changes
+_CHANGE_PARSE_WORKERS = min(8, os.cpu_count() or 1)
+
+# Size of the graph's write-ahead log at which the full graph is saved again
+_GRAPH_WAL_MAX_BYTES = 16 * 1024 * 1024
+
 
 def create_file_change_handler(
     parser: TreeSitterParser,
@@ -38,38 +49,157 @@ def create_file_change_handler(
         Callback function for FileWatcher
     """
 
-    def handle_changes(changes: dict[str, str]) -> None:
+    def handle_changes(changes: dict[str, FileChange]) -> None:
         """Handle accumulated file changes.
 
         Args:
-            changes: Dict mapping file paths to change types ("upsert" or "delete")
+            changes: Dict mapping file paths to (change type, moved-from path)
         """
-        for file_path_str, change_type in changes.items():
+        # (file path, relative path, relative path before a move)
+        upserts: list[tuple[Path, str, str | None]] = []
+
+        for file_path_str, (change_type, moved_from) in changes.items():
             file_path = Path(file_path_str)
 
             try:
                 relative_path = str(file_path.relative_to(repo_root))
+                old_relative_path = (
+                    str(Path(moved_from).relative_to(repo_root)) if moved_from else None
+                )
+            except ValueError as e:
+                logger.error(f"Failed to process {file_path}: {e}")
+                continue
 
-                if change_type == "delete":
-                    graph_builder.remove_file(relative_path)
+            if change_type == "delete":
+                try:
+                    with graph_storage.lock:
+                        graph_builder.remove_file(relative_path)
                     embedding_sync.delete_file(relative_path)
                     logger.info(f"Removed: {relative_path}")
-
-                else:  # upsert
-                    entities = parser.parse_file(file_path, repo_root)
+                except Exception as e:
+                    logger.error(f"Failed to process {file_path}: {e}")
+            else:  # upsert or move
+                upserts.append((file_path, relative_path, old_relative_path))
+
+        # Parse changed files concurrently (tree-sitter releases the GIL while
+        # parsing); graph and embedding updates below stay on this thread.
+        with ThreadPoolExecutor(max_workers=_CHANGE_PARSE_WORKERS) as executor:
+            futures = {
+                executor.submit(parser.parse_file, upsert[0], repo_root): upsert
+                for upsert in upserts
+            }
+            parsed: list[tuple[Path, str, str | None, list[AnyEntity]]] = []
+            for future, (file_path, relative_path, old_relative_path) in futures.items():
+                try:
+                    parsed.append((file_path, relative_path, old_relative_path, future.result()))
+                except Exception as e:
+                    logger.error(f"Failed to process {file_path}: {e}")
+
+        updated: list[tuple[str, list[AnyEntity]]] = []
+        for file_path, relative_path, old_relative_path, entities in parsed:
+            try:
+                with graph_storage.lock:
+                    if old_relative_path:
+                        graph_builder.remove_file(old_relative_path)
                     graph_builder.update_file(relative_path, entities)
-                    result = embedding_sync.sync_file(relative_path, entities)
-                    logger.info(f"Updated: {relative_path} ({result})")
-
+                if old_relative_path:
+                    # Renamed file: move its embeddings, replacing those of the target
+                    result = embedding_sync.move_file(old_relative_path, relative_path, entities)
+                    logger.info(f"Moved: {old_relative_path} -> {relative_path} ({result})")
+                else:
+                    updated.append((relative_path, entities))
+                    logger.info(f"Updated: {relative_path}")
             except Exception as e:
                 logger.error(f"Failed to process {file_path}: {e}")
 
-        # Save graph after processing changes
-        graph_storage.save()
+        # Embed all changed entities of the batch together
+        if updated:
+            try:
+                result = embedding_sync.sync_files(updated)
+                logger.info(f"Embedding sync for {len(updated)} files: {result}")
+            except Exception as e:
+                logger.error(f"Failed to sync embeddings: {e}")
+
+        # Persist the batch's graph changes to the log, and only occasionally
+        # rewrite the whole graph
+        graph_storage.flush_wal()
+        graph_storage.compact_if_needed(_GRAPH_WAL_MAX_BYTES)
 
     return handle_changes
 
 
+def _merge_changes(changes: dict[str, FileChange], later: dict[str, FileChange]) -> None:
+    """Merge a later batch of file changes into an earlier one, in place.
+
+    Args:
+        changes: Earlier batch, updated with the later changes
+        later: Later batch; its change to a path takes precedence
+    """
+    for path, change in later.items():
+        previous = changes.get(path)
+        if previous and previous[0] == "move" and change[0] != "move":
+            # The move is superseded; its old path must still be removed
+            moved_from = previous[1]
+            if moved_from and moved_from not in changes and moved_from not in later:
+                changes[moved_from] = ("delete", None)
+        changes[path] = change
+
+
+async def consume_file_changes(
+    queue: asyncio.Queue[dict[str, FileChange] | None],
+    handle_changes: Callable[[dict[str, FileChange]], None],
+) -> None:
+    """Process batches of file changes queued by the watcher.
+
+    Runs on the server's event loop; the blocking work of each batch runs in a
+    worker thread. Batches queued while one is processed are merged, later
+    changes to a path taking precedence. Stops when None is queued.
+
+    Args:
+        queue: Queue of change batches, None to stop
+        handle_changes: Callback created by create_file_change_handler
+    """
+    stopping = False
+    while not stopping:
+        changes = await queue.get()
+        if changes is None:
+            break
+
+        while not queue.empty():
+            more = queue.get_nowait()
+            if more is None:
+                stopping = True
+                break
+            _merge_changes(changes, more)
+
+        try:
+            await asyncio.to_thread(handle_changes, changes)
+        except Exception as e:
+            logger.error(f"Failed to handle file changes: {e}")
+
+
+def create_parse_pool(repo_name: str, cache_path: Path | None = None) -> ProcessPoolExecutor:
+    """Create the process pool used to parse whole directories.
+
+    Parsing is CPU-bound, so it is spread over processes. Workers are spawned
+    rather than forked: the server already runs threads (watcher, event loop).
+    Worker processes start lazily and are reused across indexing runs.
+
+    Args:
+        repo_name: Repository name passed to each worker's parser
+        cache_path: Optional parse cache database shared by the workers
+
+    Returns:
+        The process pool
+    """
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_parse_worker,
+        initargs=(repo_name, cache_path),
+    )
+
+
 def run_initial_indexing(
     parser: TreeSitterParser,
     graph_builder: GraphBuilder,
@@ -78,6 +208,7 @@ def run_initial_indexing(
     repo_path: Path,
     context: dict[str, Any],
     include_dirs: list[str] | None = None,
+    executor: Executor | None = None,
 ) -> None:
     """Run initial indexing in background thread.
 
@@ -89,13 +220,16 @@ def run_initial_indexing(
         repo_path: Repository root path
         context: Server context dict to update indexing_complete flag
         include_dirs: Directories to include even if normally ignored
+        executor: Optional pool to parse files in (see create_parse_pool)
     """
     try:
         logger.info("Starting background indexing...")
 
         # Phase 1: Parsing
         context["indexing_phase"] = "parsing"
-        entities = parser.parse_directory(repo_path, repo_path, include_dirs=include_dirs)
+        entities = parser.parse_directory(
+            repo_path, repo_path, include_dirs=include_dirs, executor=executor
+        )
         context["indexing_total_entities"] = len(entities)
         # Count embeddable entities (functions and classes only)
         embeddable = sum(1 for e in entities if e.entity_type in ("function", "class"))
@@ -140,6 +274,8 @@ async def lifespan(server: FastMCP):
     embedding_storage = ChromaDBStorage(
         persist_directory=config.chromadb_path,
         collection_name=config.chromadb_collection,
+        hnsw_sync_threshold=config.chromadb_hnsw_sync_threshold,
+        hnsw_batch_size=config.chromadb_hnsw_batch_size,
     )
 
     # Initialize embedding generator
@@ -152,7 +288,11 @@ async def lifespan(server: FastMCP):
 
     # Initialize parser
     logger.info("Initializing parser...")
-    parser = TreeSitterParser(config.effective_repo_name)
+    parse_cache = ParseCache(config.parse_cache_path, config.effective_repo_name)
+    parser = TreeSitterParser(config.effective_repo_name, cache=parse_cache)
+
+    # Process pool shared by initial indexing and the reindex tool
+    parse_pool = create_parse_pool(parser.repo_name, config.parse_cache_path)
 
     # Initialize graph builder
     graph_builder = GraphBuilder(graph_storage)
@@ -162,6 +302,7 @@ async def lifespan(server: FastMCP):
         generator=embedding_generator,
         storage=embedding_storage,
         repo_name=config.effective_repo_name,
+        batch_size=config.embedding_batch_size,
     )
 
     # Build context for tools (before indexing so MCP handshake completes quickly)
@@ -170,6 +311,7 @@ async def lifespan(server: FastMCP):
         "graph": graph_storage,
         "graph_builder": graph_builder,
         "parser": parser,
+        "parse_pool": parse_pool,
         "embedding_storage": embedding_storage,
         "embedding_generator": embedding_generator,
         "embedding_sync": embedding_sync,
@@ -193,6 +335,7 @@ async def lifespan(server: FastMCP):
             config.repo_path,
             context,
             config.include_dirs,
+            parse_pool,
         ),
         daemon=True,
     )
@@ -208,9 +351,15 @@ async def lifespan(server: FastMCP):
         repo_root=config.repo_path,
     )
 
+    # The watcher thread only queues batches; they are processed by a task on
+    # this event loop so shutdown can wait for the batch in progress.
+    loop = asyncio.get_running_loop()
+    change_queue: asyncio.Queue[dict[str, FileChange] | None] = asyncio.Queue()
+    consumer_task = asyncio.create_task(consume_file_changes(change_queue, change_handler))
+
     watcher = FileWatcher(
         repo_path=config.repo_path,
-        on_changes=change_handler,
+        on_changes=lambda changes: loop.call_soon_threadsafe(change_queue.put_nowait, changes),
         debounce_seconds=config.debounce_seconds,
     )
     watcher.start()
@@ -226,8 +375,13 @@ async def lifespan(server: FastMCP):
     # Cleanup
     logger.info("Shutting down Vibe RAGnar...")
     watcher.stop()
+    change_queue.put_nowait(None)
+    await consumer_task
+    parse_pool.shutdown(wait=False, cancel_futures=True)
+    parse_cache.close()
     graph_storage.save()  # Save graph on shutdown
     embedding_storage.close()
+    embedding_generator.close()
     logger.info("Shutdown complete")
 
 
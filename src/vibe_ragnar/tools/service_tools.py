@@ -1,6 +1,7 @@
 """MCP tools for service management operations."""
 
 import logging
+from concurrent.futures import Executor
 from typing import Any
 
 from fastmcp import Context
@@ -117,6 +118,7 @@ def register_service_tools(mcp) -> None:
         graph: GraphStorage = ctx.request_context.lifespan_context["graph"]
         graph_builder: GraphBuilder = ctx.request_context.lifespan_context["graph_builder"]
         embedding_sync: EmbeddingSync = ctx.request_context.lifespan_context["embedding_sync"]
+        parse_pool: Executor | None = ctx.request_context.lifespan_context.get("parse_pool")
 
         # Determine target path
         target_path = config.repo_path / path if path else config.repo_path
@@ -139,7 +141,10 @@ def register_service_tools(mcp) -> None:
             entities = parser.parse_file(target_path, config.repo_path)
         else:
             entities = parser.parse_directory(
-                target_path, config.repo_path, include_dirs=config.include_dirs
+                target_path,
+                config.repo_path,
+                include_dirs=config.include_dirs,
+                executor=parse_pool,
             )
 
         # Build graph
@@ -1,8 +1,9 @@
 """File watcher module for real-time code indexing updates."""
 
-from .handler import DebouncedFileHandler, FileWatcher
+from .handler import DebouncedFileHandler, FileChange, FileWatcher
 
 __all__ = [
     "DebouncedFileHandler",
+    "FileChange",
     "FileWatcher",
 ]
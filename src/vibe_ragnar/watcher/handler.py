@@ -1,9 +1,12 @@
 """File watcher with debouncing for real-time code indexing updates."""
 
+import contextlib
 import logging
+import os
 import threading
+import time
+from collections.abc import Callable, Iterable
 from pathlib import Path
-from typing import Callable
 
 from watchdog.events import (
     DirCreatedEvent,
@@ -18,11 +21,57 @@ from watchdog.events import (
     FileSystemEventHandler,
 )
 from watchdog.observers import Observer
+from watchdog.observers.api import ObservedWatch
 
-from ..parser.languages import IGNORED_DIRECTORIES, is_supported_file
+from ..parser.languages import EXTENSION_TO_LANGUAGE, should_ignore_name
 
 logger = logging.getLogger(__name__)
 
+# A change as passed to the callback: (change type, moved-from path). The change
+# type is "upsert", "delete" or "move"; the moved-from path is only set for moves.
+FileChange = tuple[str, str | None]
+
+# Extensions watched by default, snapshotted once for per-event membership checks
+_SUPPORTED_EXTENSIONS = frozenset(EXTENSION_TO_LANGUAGE)
+
+# Most top-level directories watched individually; each watch has its own
+# emitter thread and inotify instance (max_user_instances defaults to 128 and
+# is shared with editors), so larger repos use one recursive watch
+_MAX_SUBDIRECTORY_WATCHES = 8
+
+
+def _existing_paths(paths: Iterable[str]) -> set[str]:
+    """Find which of the given paths currently exist.
+
+    Paths are grouped by directory and each directory is listed once, instead
+    of one stat call per path.
+
+    Args:
+        paths: File paths to check
+
+    Returns:
+        The subset of paths that exist
+    """
+    names_by_dir: dict[str, list[tuple[str, str]]] = {}
+    for path in paths:
+        directory, name = os.path.split(path)
+        names_by_dir.setdefault(directory, []).append((path, name))
+
+    existing: set[str] = set()
+    for directory, entries in names_by_dir.items():
+        if len(entries) == 1:
+            path = entries[0][0]
+            if os.path.exists(path):
+                existing.add(path)
+            continue
+        try:
+            dir_names = set(os.listdir(directory))
+        except OSError:
+            # Directory removed (or unreadable): none of its files exist
+            continue
+        existing.update(path for path, name in entries if name in dir_names)
+    return existing
+
 
 class DebouncedFileHandler(FileSystemEventHandler):
     """File system event handler with debouncing.
@@ -34,51 +83,74 @@ class DebouncedFileHandler(FileSystemEventHandler):
 
     def __init__(
         self,
-        on_changes_callback: Callable[[dict[str, str]], None],
+        on_changes_callback: Callable[[dict[str, FileChange]], None],
         debounce_seconds: float = 5.0,
         supported_extensions: set[str] | None = None,
+        max_batch_size: int = 2000,
+        max_delay_seconds: float = 30.0,
+        root: Path | None = None,
     ):
         """Initialize the debounced handler.
 
         Args:
             on_changes_callback: Function called with accumulated changes
-                                 Dict maps file path to change type ("upsert" or "delete")
+                                 Dict maps file path to a FileChange; a renamed
+                                 file appears once, under its new path, as a move
             debounce_seconds: Seconds to wait for quiet period before processing
             supported_extensions: File extensions to monitor (default: all supported)
+            max_batch_size: Number of pending files that forces a flush
+            max_delay_seconds: Longest time a change may wait while events keep
+                               arriving before a flush is forced
+            root: Watched root directory; only path components below it are
+                  checked against the ignore rules
         """
         super().__init__()
         self._callback = on_changes_callback
         self._debounce_seconds = debounce_seconds
-        self._supported_extensions = supported_extensions
+        self._supported_extensions = (
+            frozenset(supported_extensions) if supported_extensions else _SUPPORTED_EXTENSIONS
+        )
+        self._max_batch_size = max_batch_size
+        self._max_delay_seconds = max_delay_seconds
+        self._root_prefix = os.path.join(os.fspath(root), "") if root else ""
 
-        self._pending_changes: dict[str, str] = {}  # path -> change_type
-        self._timer: threading.Timer | None = None
+        self._pending_changes: dict[str, FileChange] = {}  # path -> change
+        self._first_change_time = 0.0  # monotonic time of oldest pending change
+        self._last_change_time = 0.0  # monotonic time of newest pending change
         self._lock = threading.Lock()
+        self._stopped = False
+
+        # A single long-lived thread waits for the quiet period and flushes,
+        # instead of a new Timer thread being started for every event
+        self._wake = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="vibe-ragnar-debounce", daemon=True)
+        self._worker.start()
 
     def _should_process(self, path: str) -> bool:
         """Check if a file should be processed.
 
+        Called for every filesystem event, so it sticks to string operations
+        rather than building a Path.
+
         Args:
             path: File path to check
 
         Returns:
             True if the file should be monitored
         """
-        path_obj = Path(path)
-
-        # Check if path is in an ignored directory
-        for part in path_obj.parts:
-            if part in IGNORED_DIRECTORIES:
-                return False
-            # Also ignore hidden directories
-            if part.startswith(".") and part not in {".github", ".gitlab"}:
+        # Only components below the watched root can be ignored directories
+        if self._root_prefix and path.startswith(self._root_prefix):
+            path_in_root = path[len(self._root_prefix) :]
+        else:
+            path_in_root = path
+
+        # Check if path is in an ignored (or hidden) directory
+        for part in path_in_root.split(os.sep):
+            if part and should_ignore_name(part):
                 return False
 
         # Check file extension
-        if self._supported_extensions:
-            return path_obj.suffix.lower() in self._supported_extensions
-
-        return is_supported_file(path)
+        return os.path.splitext(path)[1].lower() in self._supported_extensions
 
     def on_created(self, event: FileCreatedEvent | DirCreatedEvent) -> None:
         """Handle file/directory creation."""
@@ -102,40 +174,79 @@ class DebouncedFileHandler(FileSystemEventHandler):
         """Handle file/directory move/rename."""
         if isinstance(event, DirMovedEvent):
             return
-        # Treat as delete of old path and create of new path
-        self._handle_change(event.src_path, "delete")
-        self._handle_change(event.dest_path, "upsert")
-
-    def _handle_change(self, path: str, change_type: str) -> None:
+        # Record a delete of the old path and a move to the new one; the move
+        # falls back to a plain upsert when the old path was not indexed
+        moved_from = event.src_path if self._should_process(event.src_path) else None
+        if moved_from:
+            self._handle_change(moved_from, "delete")
+        if moved_from and self._should_process(event.dest_path):
+            self._handle_change(event.dest_path, "move", moved_from)
+        else:
+            self._handle_change(event.dest_path, "upsert")
+
+    def _handle_change(self, path: str, change_type: str, moved_from: str | None = None) -> None:
         """Handle a file change event.
 
         Args:
             path: Path to the changed file
-            change_type: Type of change ("upsert" or "delete")
+            change_type: Type of change ("upsert", "delete" or "move")
+            moved_from: Previous path of a moved file
         """
         if not self._should_process(path):
             return
 
         with self._lock:
             # Record the change
-            self._pending_changes[path] = change_type
-
-            # Reset the debounce timer
-            if self._timer is not None:
-                self._timer.cancel()
-
-            self._timer = threading.Timer(
-                self._debounce_seconds,
-                self._flush_changes,
-            )
-            self._timer.daemon = True
-            self._timer.start()
+            now = time.monotonic()
+            if not self._pending_changes:
+                self._first_change_time = now
+            self._last_change_time = now
+            self._pending_changes[path] = (change_type, moved_from)
 
             logger.debug(
                 f"File change queued: {path} ({change_type}), "
                 f"pending: {len(self._pending_changes)}"
             )
 
+        self._wake.set()
+
+    def _seconds_until_flush(self) -> float | None:
+        """Get how long the pending changes may still wait.
+
+        Must be called with the lock held.
+
+        Returns:
+            Seconds until the next flush is due (0 if due now), or None if
+            nothing is pending
+        """
+        if not self._pending_changes:
+            return None
+        if len(self._pending_changes) >= self._max_batch_size:
+            return 0.0
+        # Flush after a quiet period, but a steady event stream must not
+        # postpone the flush beyond the maximum delay
+        deadline = min(
+            self._last_change_time + self._debounce_seconds,
+            self._first_change_time + self._max_delay_seconds,
+        )
+        return max(0.0, deadline - time.monotonic())
+
+    def _run(self) -> None:
+        """Wait for flushes to become due and run them, until stopped."""
+        while True:
+            self._wake.clear()
+            with self._lock:
+                if self._stopped:
+                    return
+                timeout = self._seconds_until_flush()
+
+            if timeout is None or timeout > 0:
+                # Sleep until due, or until new events / stop() wake us early
+                self._wake.wait(timeout)
+                continue
+
+            self._flush_changes()
+
     def _flush_changes(self) -> None:
         """Flush accumulated changes to the callback."""
         with self._lock:
@@ -144,19 +255,29 @@ class DebouncedFileHandler(FileSystemEventHandler):
 
             changes = dict(self._pending_changes)
             self._pending_changes.clear()
-            self._timer = None
 
         # Fix change types based on actual file existence
         # Some editors do atomic saves (delete + create), so we check if file exists
-        corrected_changes: dict[str, str] = {}
-        for path, change_type in changes.items():
-            path_obj = Path(path)
-            if path_obj.exists():
-                # File exists -> it's an upsert regardless of recorded events
-                corrected_changes[path] = "upsert"
+        existing = _existing_paths(changes)
+        corrected_changes: dict[str, FileChange] = {}
+        moved_away: set[str] = set()
+        for path, (change_type, moved_from) in changes.items():
+            if path not in existing:
+                corrected_changes[path] = ("delete", None)
+            elif (
+                change_type == "move"
+                and moved_from not in existing
+                and moved_from not in moved_away
+                and changes.get(moved_from, ("", None))[0] == "delete"
+            ):
+                # A pure rename: the move replaces the delete of the old path
+                corrected_changes[path] = ("move", moved_from)
+                moved_away.add(moved_from)
             else:
-                # File doesn't exist -> it's a delete
-                corrected_changes[path] = "delete"
+                # Existing file -> upsert regardless of recorded events
+                corrected_changes[path] = ("upsert", None)
+        for path in moved_away:
+            del corrected_changes[path]
 
         logger.info(f"Processing {len(corrected_changes)} file changes")
 
@@ -166,11 +287,39 @@ class DebouncedFileHandler(FileSystemEventHandler):
             logger.error(f"Error processing file changes: {e}")
 
     def stop(self) -> None:
-        """Stop any pending timer."""
+        """Stop the debounce thread, discarding changes that were not flushed."""
         with self._lock:
-            if self._timer is not None:
-                self._timer.cancel()
-                self._timer = None
+            self._stopped = True
+            self._pending_changes.clear()
+        self._wake.set()
+        if self._worker is not threading.current_thread():
+            self._worker.join(timeout=5.0)
+
+
+class _TopLevelDirectoryTracker(FileSystemEventHandler):
+    """Keep the per-directory watches of a FileWatcher in sync with the repository root.
+
+    Only receives events from the non-recursive watch on the root, i.e. for
+    its direct children.
+    """
+
+    def __init__(self, watcher: "FileWatcher"):
+        super().__init__()
+        self._watcher = watcher
+
+    def on_created(self, event: FileCreatedEvent | DirCreatedEvent) -> None:
+        if isinstance(event, DirCreatedEvent):
+            self._watcher._watch_subdirectory(os.fsdecode(event.src_path), report_files=True)
+
+    def on_deleted(self, event: FileDeletedEvent | DirDeletedEvent) -> None:
+        if isinstance(event, DirDeletedEvent):
+            self._watcher._unwatch_subdirectory(os.fsdecode(event.src_path))
+
+    def on_moved(self, event: FileMovedEvent | DirMovedEvent) -> None:
+        if isinstance(event, DirMovedEvent):
+            src_path = os.fsdecode(event.src_path)
+            self._watcher._unwatch_subdirectory(src_path)
+            self._watcher._watch_subdirectory(os.fsdecode(event.dest_path), moved_from=src_path)
 
 
 class FileWatcher:
@@ -179,7 +328,7 @@ class FileWatcher:
     def __init__(
         self,
         repo_path: Path,
-        on_changes: Callable[[dict[str, str]], None],
+        on_changes: Callable[[dict[str, FileChange]], None],
         debounce_seconds: float = 5.0,
     ):
         """Initialize the file watcher.
@@ -195,10 +344,18 @@ class FileWatcher:
         self._handler = DebouncedFileHandler(
             on_changes_callback=on_changes,
             debounce_seconds=debounce_seconds,
+            root=repo_path,
         )
         self._observer = Observer()
         self._running = False
 
+        # Top-level directory -> its recursive watch, when ignored top-level
+        # directories (node_modules, .venv, ...) are kept out of the observer
+        self._subdirectory_watches: dict[str, ObservedWatch] = {}
+        # Set once the root is watched recursively as a whole
+        self._watching_root_recursively = False
+        self._tracker = _TopLevelDirectoryTracker(self)
+
     @property
     def is_running(self) -> bool:
         """Check if the watcher is running."""
@@ -210,16 +367,104 @@ class FileWatcher:
             logger.warning("FileWatcher is already running")
             return
 
-        self._observer.schedule(
-            self._handler,
-            str(self._repo_path),
-            recursive=True,
-        )
-        self._observer.start()
+        subdirectories = self._top_level_directories()
+        if subdirectories is None:
+            self._observer.schedule(
+                self._handler,
+                str(self._repo_path),
+                recursive=True,
+            )
+            self._watching_root_recursively = True
+            self._observer.start()
+        else:
+            # Watch the root's own entries, and each non-ignored top-level
+            # directory recursively, so ignored trees get no OS-level watches
+            root_watch = self._observer.schedule(self._handler, str(self._repo_path))
+            self._observer.add_handler_for_watch(self._tracker, root_watch)
+            # A running observer starts each emitter inside schedule(), so
+            # running out of inotify instances surfaces in _watch_subdirectory
+            self._observer.start()
+            for path in subdirectories:
+                self._watch_subdirectory(path)
         self._running = True
 
         logger.info(f"FileWatcher started for {self._repo_path}")
 
+    def _top_level_directories(self) -> list[str] | None:
+        """List the top-level directories to watch individually.
+
+        Returns:
+            Paths of the non-ignored directories directly below the root, or
+            None if there are too many to watch one by one
+        """
+        directories: list[str] = []
+        with os.scandir(self._repo_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and not should_ignore_name(entry.name):
+                    directories.append(entry.path)
+        if len(directories) > _MAX_SUBDIRECTORY_WATCHES:
+            return None
+        return directories
+
+    def _watch_subdirectory(
+        self, path: str, report_files: bool = False, moved_from: str | None = None
+    ) -> None:
+        """Start watching a top-level directory recursively.
+
+        Args:
+            path: Directory directly below the root
+            report_files: Report files already in the directory as created,
+                since they may predate the watch
+            moved_from: Previous path of a directory moved within the root; its
+                files are reported as moved
+        """
+        if self._watching_root_recursively:
+            return
+        if should_ignore_name(os.path.basename(path)) or path in self._subdirectory_watches:
+            return
+        try:
+            self._subdirectory_watches[path] = self._observer.schedule(
+                self._handler, path, recursive=True
+            )
+        except OSError as e:
+            logger.warning(f"Could not watch {path} ({e}), watching the repository as a whole")
+            self._watch_root_recursively()
+
+        if not report_files and moved_from is None:
+            return
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if not should_ignore_name(d)]
+            for filename in filenames:
+                file_path = os.path.join(dirpath, filename)
+                if moved_from is not None:
+                    old_path = os.path.join(moved_from, os.path.relpath(file_path, path))
+                    self._handler.on_moved(FileMovedEvent(old_path, file_path))
+                else:
+                    self._handler.on_created(FileCreatedEvent(file_path))
+
+    def _watch_root_recursively(self) -> None:
+        """Replace the per-directory watches with one recursive watch on the root.
+
+        Frees the inotify instances of the per-directory watches, so that the
+        single watch can start where one more of them could not.
+        """
+        self._observer.unschedule_all()
+        self._subdirectory_watches.clear()
+        self._watching_root_recursively = True
+        self._observer.schedule(self._handler, str(self._repo_path), recursive=True)
+
+    def _unwatch_subdirectory(self, path: str) -> None:
+        """Stop watching a top-level directory that was removed or moved away.
+
+        Args:
+            path: Directory directly below the root
+        """
+        watch = self._subdirectory_watches.pop(path, None)
+        if watch is None:
+            return
+        with contextlib.suppress(KeyError):
+            self._observer.unschedule(watch)
+
     def stop(self) -> None:
         """Stop watching for file changes."""
         if not self._running:
@@ -0,0 +1,35 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from vibe_ragnar.graph import GraphBuilder, GraphStorage
+from vibe_ragnar.parser import TreeSitterParser
+
+
+@pytest.fixture
+def storage() -> GraphStorage:
+    """Empty in-memory graph storage."""
+    return GraphStorage()
+
+
+@pytest.fixture
+def builder(storage: GraphStorage) -> GraphBuilder:
+    """Graph builder writing into the `storage` fixture."""
+    return GraphBuilder(storage)
+
+
+@pytest.fixture(scope="session")
+def _shared_parser() -> TreeSitterParser:
+    """Parser for the "test-repo" repository, shared so each grammar is set up once."""
+    return TreeSitterParser("test-repo")
+
+
+@pytest.fixture
+def parser(_shared_parser: TreeSitterParser) -> TreeSitterParser:
+    """The shared parser without trees kept from earlier tests.
+
+    Tests reuse virtual paths such as "test.py", which would otherwise be
+    parsed incrementally against another test's source.
+    """
+    _shared_parser._trees.clear()
+    return _shared_parser
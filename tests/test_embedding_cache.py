@@ -0,0 +1,46 @@
+"""Tests for the persistent embedding cache."""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from vibe_ragnar.embeddings.cache import EmbeddingCache  # noqa: E402
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache class."""
+
+    def test_evicts_least_recently_used_beyond_bound(self, tmp_path):
+        """Test that vectors not read or written recently are evicted first."""
+        cache = EmbeddingCache(tmp_path / "cache.sqlite", "model", max_entries=2)
+        cache.put_many([(b"old", [1.0])])
+        cache.put_many([(b"used", [2.0])])
+        cache._conn.execute("UPDATE embedding_cache SET last_used = 1 WHERE hash = ?", (b"old",))
+        cache.get_many([b"used"])
+
+        cache.put_many([(b"new", [3.0])])
+
+        assert set(cache.get_many([b"old", b"used", b"new"])) == {b"used", b"new"}
+        cache.close()
+
+    def test_adds_last_used_to_existing_database(self, tmp_path):
+        """Test that a cache written without eviction support is migrated and bounded."""
+        db_path = tmp_path / "cache.sqlite"
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE embedding_cache (hash BLOB NOT NULL, model TEXT NOT NULL, "
+            "vector BLOB NOT NULL, PRIMARY KEY (hash, model))"
+        )
+        conn.executemany(
+            "INSERT INTO embedding_cache VALUES (?, ?, ?)",
+            [(bytes([i]), "model", b"\x00\x00\x80?") for i in range(3)],
+        )
+        conn.commit()
+        conn.close()
+
+        cache = EmbeddingCache(db_path, "model", max_entries=2)
+
+        assert len(cache.get_many([bytes([i]) for i in range(3)])) == 2
+        cache.close()
@@ -0,0 +1,100 @@
+"""Tests for incremental embedding synchronization."""
+
+from typing import Any
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from vibe_ragnar.embeddings.sync import EmbeddingSync  # noqa: E402
+from vibe_ragnar.parser import Function  # noqa: E402
+
+
+class InMemoryStorage:
+    """Minimal stand-in for ChromaDBStorage keeping embeddings in a dict."""
+
+    def __init__(self) -> None:
+        self.items: dict[str, tuple[list[float], dict[str, Any]]] = {}
+
+    def bulk_upsert(self, items: list[tuple[str, list[float], dict[str, Any]]]) -> int:
+        for entity_id, embedding, metadata in items:
+            self.items[entity_id] = (embedding, metadata)
+        return len(items)
+
+    def get_file_embeddings(self, repo: str, file_path: str) -> dict[str, tuple[list[float], str]]:
+        return {
+            entity_id: (embedding, metadata["content_hash"])
+            for entity_id, (embedding, metadata) in self.items.items()
+            if metadata["repo"] == repo and metadata["file_path"] == file_path
+        }
+
+    def delete_by_file(self, repo: str, file_path: str) -> int:
+        doomed = list(self.get_file_embeddings(repo, file_path))
+        for entity_id in doomed:
+            del self.items[entity_id]
+        return len(doomed)
+
+
+class FixedGenerator:
+    """Embedding generator returning the same vector for every entity."""
+
+    def __init__(self, include_path: bool = True) -> None:
+        self.include_path = include_path
+
+    def prepare_entity_text(self, entity: Function) -> str:
+        if self.include_path:
+            return f"File: {entity.file_path}\n{entity.code}"
+        return entity.code
+
+    def embed_entities(self, entities: list) -> list[tuple[Any, list[float]]]:
+        return [(entity, [1.0, 0.0]) for entity in entities]
+
+
+def make_function(name: str, file_path: str) -> Function:
+    """Build a Function in the "test" repository."""
+    return Function(
+        repo="test",
+        file_path=file_path,
+        name=name,
+        start_line=1,
+        end_line=2,
+        signature=f"{name}()",
+        code=f"def {name}(): pass",
+    )
+
+
+class TestEmbeddingSync:
+    """Tests for EmbeddingSync class."""
+
+    def test_move_over_existing_file_replaces_its_embeddings(self):
+        """Test a rename onto an existing file leaves none of that file's old embeddings."""
+        storage = InMemoryStorage()
+        sync = EmbeddingSync(FixedGenerator(), storage, "test")
+        sync._process_batch([make_function("moved", "a.py"), make_function("stale", "b.py")])
+
+        result = sync.move_file("a.py", "b.py", [make_function("moved", "b.py")])
+
+        assert set(storage.items) == {"test:b.py:moved"}
+        assert result.deleted == 2
+
+    def test_move_reembeds_entities_whose_text_names_the_file(self):
+        """Test a vector is not reused when the embedded text changes with the path."""
+        storage = InMemoryStorage()
+        sync = EmbeddingSync(FixedGenerator(), storage, "test")
+        sync._process_batch([make_function("moved", "a.py")])
+
+        result = sync.move_file("a.py", "b.py", [make_function("moved", "b.py")])
+
+        assert (result.added, result.skipped) == (1, 0)
+        assert set(storage.items) == {"test:b.py:moved"}
+
+    def test_move_reuses_vectors_of_unchanged_text(self):
+        """Test a vector is moved to the new ID when the embedded text is unchanged."""
+        storage = InMemoryStorage()
+        sync = EmbeddingSync(FixedGenerator(include_path=False), storage, "test")
+        sync._process_batch([make_function("moved", "a.py")])
+
+        result = sync.move_file("a.py", "b.py", [make_function("moved", "b.py")])
+
+        assert (result.added, result.skipped) == (0, 1)
+        assert set(storage.items) == {"test:b.py:moved"}
@@ -1,5 +1,9 @@
 """Tests for the graph module."""
 
+from operator import itemgetter
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
 import pytest
 
 from vibe_ragnar.graph import (
@@ -19,22 +23,54 @@ from vibe_ragnar.graph import (
 )
 from vibe_ragnar.parser import Function, Class, File
 
+_name = itemgetter("name")
+
+
+def make_function(
+    name: str,
+    start_line: int = 1,
+    *,
+    end_line: int | None = None,
+    file_path: str = "test.py",
+    calls: list[str] | None = None,
+    class_name: str | None = None,
+    signature: str | None = None,
+    code: str | None = None,
+) -> Function:
+    """Build a test Function whose signature and code follow from its name and calls."""
+    params = "self" if class_name else ""
+    calls = calls or []
+    body = "; ".join(f"{call}()" for call in calls) or "pass"
+    return Function(
+        repo="test",
+        file_path=file_path,
+        name=name,
+        start_line=start_line,
+        end_line=end_line if end_line is not None else start_line + 1,
+        signature=signature or f"{name}({params})",
+        code=code or f"def {name}({params}): {body}",
+        calls=calls,
+        class_name=class_name,
+    )
+
+
+@pytest.fixture
+def call_chain(builder: GraphBuilder) -> tuple[Function, Function, Function]:
+    """Functions a -> b -> c, built into the `storage` fixture."""
+    func_a = make_function("a", calls=["b"])
+    func_b = make_function("b", 4, calls=["c"])
+    func_c = make_function("c", 7)
+    builder.build_from_entities([func_a, func_b, func_c])
+    return func_a, func_b, func_c
+
 
 class TestGraphStorage:
     """Tests for GraphStorage class."""
 
-    def test_add_and_get_entity(self):
+    def test_add_and_get_entity(self, storage):
         """Test adding and retrieving entities."""
-        storage = GraphStorage()
-
-        func = Function(
-            repo="test",
-            file_path="test.py",
-            name="hello",
-            start_line=1,
-            end_line=3,
-            signature="hello(name: str)",
-            code="def hello(name: str): pass",
+        func = make_function(
+            "hello", end_line=3, signature="hello(name: str)", code="def hello(name: str): pass"
         )
 
         storage.add_entity(func)
@@ -43,62 +79,51 @@ class TestGraphStorage:
         assert retrieved is not None
         assert retrieved["name"] == "hello"
         assert retrieved["type"] == "function"
+        assert "code" not in retrieved["data"]
 
-    def test_add_edge(self):
+    def test_add_edge(self, storage):
         """Test adding edges between entities."""
-        storage = GraphStorage()
+        func1 = make_function("caller", end_line=3, code="def caller(): callee()")
+        func2 = make_function("callee", 5, end_line=7)
 
-        func1 = Function(
-            repo="test", file_path="test.py", name="caller",
-            start_line=1, end_line=3, signature="caller()",
-            code="def caller(): callee()",
-        )
-        func2 = Function(
-            repo="test", file_path="test.py", name="callee",
-            start_line=5, end_line=7, signature="callee()",
-            code="def callee(): pass",
-        )
-
-        storage.add_entity(func1)
-        storage.add_entity(func2)
+        storage.add_entities([func1, func2])
         storage.add_edge(func1.id, func2.id, EdgeType.CALLS)
 
         successors = storage.get_successors(func1.id, EdgeType.CALLS)
-        assert len(successors) == 1
-        assert successors[0][0] == func2.id
+        assert [target_id for target_id, _ in successors] == [func2.id]
 
-    def test_get_predecessors(self):
+    def test_get_predecessors(self, storage):
         """Test getting predecessor entities."""
-        storage = GraphStorage()
+        func1 = make_function("caller", end_line=3)
+        func2 = make_function("callee", 5, end_line=7)
 
-        func1 = Function(
-            repo="test", file_path="test.py", name="caller",
-            start_line=1, end_line=3, signature="caller()",
-            code="def caller(): pass",
-        )
-        func2 = Function(
-            repo="test", file_path="test.py", name="callee",
-            start_line=5, end_line=7, signature="callee()",
-            code="def callee(): pass",
-        )
-
-        storage.add_entity(func1)
-        storage.add_entity(func2)
+        storage.add_entities([func1, func2])
         storage.add_edge(func1.id, func2.id, EdgeType.CALLS)
 
         predecessors = storage.get_predecessors(func2.id, EdgeType.CALLS)
-        assert len(predecessors) == 1
-        assert predecessors[0][0] == func1.id
+        assert [source_id for source_id, _ in predecessors] == [func1.id]
 
-    def test_get_statistics(self):
-        """Test graph statistics."""
-        storage = GraphStorage()
+    def test_neighbors_filtered_by_edge_type(self, storage):
+        """Test edge type filtering and lookups of unknown entities."""
+        func1 = make_function("caller", end_line=3)
+        func2 = make_function("callee", 5, end_line=7)
+        func3 = make_function("helper", 9, end_line=11)
 
-        func = Function(
-            repo="test", file_path="test.py", name="foo",
-            start_line=1, end_line=2, signature="foo()",
-            code="def foo(): pass",
-        )
+        storage.add_entities([func1, func2, func3])
+        storage.add_edge(func1.id, func2.id, EdgeType.CALLS)
+        storage.add_edge(func1.id, func3.id, EdgeType.USES)
+
+        assert storage.get_successors(func1.id, EdgeType.USES) == [(func3.id, {"type": "uses"})]
+        assert [target_id for target_id, _ in storage.get_successors(func1.id)] == [
+            func2.id,
+            func3.id,
+        ]
+        assert storage.get_predecessors(func3.id, EdgeType.CALLS) == []
+        assert storage.get_successors("test:missing.py:nothing") == []
+
+    def test_get_statistics(self, storage):
+        """Test graph statistics."""
+        func = make_function("foo")
         cls = Class(
             repo="test", file_path="test.py", name="Bar",
             start_line=4, end_line=10, code="class Bar: pass",
@@ -108,68 +133,103 @@ class TestGraphStorage:
             start_line=1, end_line=10, language="python",
         )
 
-        storage.add_entity(func)
-        storage.add_entity(cls)
-        storage.add_entity(file)
+        storage.add_entities([func, cls, file])
 
-        stats = storage.get_statistics()
-        assert stats["nodes"] == 3
-        assert stats["functions"] == 1
-        assert stats["classes"] == 1
-        assert stats["files"] == 1
+        assert storage.get_statistics() == {
+            "nodes": 3,
+            "edges": 0,
+            "functions": 1,
+            "classes": 1,
+            "files": 1,
+            "types": 0,
+            "external": 0,
+        }
 
-    def test_remove_file(self):
-        """Test removing all entities from a file."""
-        storage = GraphStorage()
+    def test_statistics_cache_invalidated_on_change(self, storage):
+        """Test cached statistics reflect later mutations."""
+        func = make_function("foo")
 
-        func = Function(
-            repo="test", file_path="test.py", name="foo",
-            start_line=1, end_line=2, signature="foo()",
-            code="def foo(): pass",
-        )
+        assert storage.get_statistics()["functions"] == 0
+        storage.add_entity(func)
+        assert storage.get_statistics()["functions"] == 1
+        storage.remove_file("test.py")
+        assert storage.get_statistics()["nodes"] == 0
+
+    def test_remove_file(self, storage):
+        """Test removing all entities from a file."""
+        func = make_function("foo")
         file = File(
             repo="test", file_path="test.py", name="test.py",
             start_line=1, end_line=2, language="python",
         )
 
-        storage.add_entity(func)
-        storage.add_entity(file)
+        storage.add_entities([func, file])
 
         removed = storage.remove_file("test.py")
         assert len(removed) == 2
         assert storage.get_statistics()["nodes"] == 0
 
+    def test_save_and_load_round_trip(self):
+        """Test a saved graph loads back with the same nodes and edges."""
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "graph.pickle"
+            storage = GraphStorage(path)
+
+            caller = make_function("caller", end_line=3, code="def caller(): callee()")
+            callee = make_function("callee", 5, end_line=7)
+            storage.add_entities([caller, callee])
+            storage.add_edge(caller.id, callee.id, EdgeType.CALLS)
+            storage.add_edge_by_name(caller.id, "os.path", EdgeType.USES, create_if_missing=True)
+            assert storage.save()
+
+            loaded = GraphStorage(path)
+
+        assert dict(loaded.graph.nodes(data=True)) == dict(storage.graph.nodes(data=True))
+        assert sorted(loaded.graph.edges(data="type")) == sorted(storage.graph.edges(data="type"))
+
+    def test_wal_replayed_on_load(self):
+        """Test changes flushed to the log after a save survive a reload."""
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "graph.pickle"
+            storage = GraphStorage(path)
+            builder = GraphBuilder(storage)
+
+            first = make_function("first", file_path="a.py")
+            second = make_function("second", file_path="b.py", calls=["first"])
+            builder.build_from_entities([first])
+            assert storage.save()
+
+            builder.update_file("b.py", [second])
+            builder.remove_file("a.py")
+            assert storage.flush_wal()
+            assert storage.wal_size > 0
+
+            loaded = GraphStorage(path)
+            assert set(loaded.graph.nodes) == set(storage.graph.nodes)
+            assert sorted(loaded.graph.edges(data="type")) == sorted(
+                storage.graph.edges(data="type")
+            )
+
+            # Saving folds the log into the graph file
+            assert loaded.save()
+            assert loaded.wal_size == 0
+
 
 class TestGraphBuilder:
     """Tests for GraphBuilder class."""
 
-    def test_build_call_edges(self):
+    def test_build_call_edges(self, storage, builder):
         """Test building CALLS edges from function calls."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
-        caller = Function(
-            repo="test", file_path="test.py", name="caller",
-            start_line=1, end_line=3, signature="caller()",
-            code="def caller(): callee()", calls=["callee"],
-        )
-        callee = Function(
-            repo="test", file_path="test.py", name="callee",
-            start_line=5, end_line=7, signature="callee()",
-            code="def callee(): pass",
-        )
+        caller = make_function("caller", end_line=3, calls=["callee"])
+        callee = make_function("callee", 5, end_line=7)
 
         builder.build_from_entities([caller, callee])
 
         calls = get_function_calls(storage, caller.id)
-        assert len(calls) == 1
-        assert calls[0]["name"] == "callee"
+        assert list(map(_name, calls)) == ["callee"]
 
-    def test_build_inheritance_edges(self):
+    def test_build_inheritance_edges(self, storage, builder):
         """Test building INHERITS edges from class bases."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
         parent = Class(
             repo="test", file_path="test.py", name="Parent",
             start_line=1, end_line=3, code="class Parent: pass",
@@ -184,33 +244,41 @@ class TestGraphBuilder:
 
         # Child should have INHERITS edge to Parent
         successors = storage.get_successors(child.id, EdgeType.INHERITS)
-        assert len(successors) == 1
-        assert successors[0][0] == parent.id
+        assert [target_id for target_id, _ in successors] == [parent.id]
+
+    def test_update_file_keeps_edges_from_other_files(self, storage, builder):
+        """Test re-adding a file yields the same edges as the full build."""
+        callee = make_function("callee", file_path="x.py")
+        caller = make_function("caller", file_path="y.py", calls=["callee"])
+        builder.build_from_entities([callee, caller])
+        edges = set(storage.graph.edges(data="type"))
+
+        builder.update_file(Path("x.py"), [callee])
+
+        assert set(storage.graph.edges(data="type")) == edges
+
+    def test_remove_file_leaves_external_reference(self, storage, builder):
+        """Test callers of a removed file point to a placeholder that resolves later."""
+        callee = make_function("callee", file_path="x.py")
+        caller = make_function("caller", file_path="y.py", calls=["callee"])
+        builder.build_from_entities([callee, caller])
+
+        builder.remove_file(Path("x.py"))
+        assert [t for t, _ in storage.get_successors(caller.id)] == ["external:callee"]
+
+        moved = make_function("callee", file_path="z.py")
+        builder.update_file(Path("z.py"), [moved])
+        assert [t for t, _ in storage.get_successors(caller.id)] == [moved.id]
 
 
 class TestGraphQueries:
     """Tests for graph query functions."""
 
-    def test_find_symbol(self):
+    def test_find_symbol(self, storage, builder):
         """Test finding symbols by name."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
-        func1 = Function(
-            repo="test", file_path="a.py", name="process",
-            start_line=1, end_line=2, signature="process()",
-            code="def process(): pass",
-        )
-        func2 = Function(
-            repo="test", file_path="b.py", name="process",
-            start_line=1, end_line=2, signature="process()",
-            code="def process(): pass",
-        )
-        func3 = Function(
-            repo="test", file_path="a.py", name="other",
-            start_line=4, end_line=5, signature="other()",
-            code="def other(): pass",
-        )
+        func1 = make_function("process", file_path="a.py")
+        func2 = make_function("process", file_path="b.py")
+        func3 = make_function("other", 4, file_path="a.py")
 
         builder.build_from_entities([func1, func2, func3])
 
@@ -222,95 +290,72 @@ class TestGraphQueries:
         results = find_symbol(storage, "process", file_context="a.py")
         assert results[0]["file_path"] == "a.py"
 
-    def test_get_callers(self):
-        """Test getting callers of a function."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
+    def test_find_symbol_qualified_and_after_removal(self, storage, builder):
+        """Test qualified lookups and that removed entities are no longer found."""
+        method = make_function("process", class_name="Worker", file_path="a.py")
+        func = make_function("process", 4, file_path="b.py")
+        builder.build_from_entities([method, func])
 
-        callee = Function(
-            repo="test", file_path="test.py", name="callee",
-            start_line=1, end_line=2, signature="callee()",
-            code="def callee(): pass",
-        )
-        caller1 = Function(
-            repo="test", file_path="test.py", name="caller1",
-            start_line=4, end_line=6, signature="caller1()",
-            code="def caller1(): callee()", calls=["callee"],
-        )
-        caller2 = Function(
-            repo="test", file_path="test.py", name="caller2",
-            start_line=8, end_line=10, signature="caller2()",
-            code="def caller2(): callee()", calls=["callee"],
-        )
+        results = find_symbol(storage, "Worker.process")
+        assert [r["id"] for r in results] == [method.id]
+
+        builder.remove_file("a.py")
+
+        results = find_symbol(storage, "process")
+        assert [r["id"] for r in results] == [func.id]
+
+    def test_symbol_index_survives_edge_inserts(self, storage, builder):
+        """Test building a large graph keeps one symbol index, updated node by node."""
+        functions = [
+            make_function(
+                f"func_{i}",
+                file_path=f"mod_{i % 50}.py",
+                calls=[f"func_{(i + k) % 3000}" for k in range(1, 4)] + [f"lib_{i % 7}", "print"],
+            )
+            for i in range(3000)
+        ]
+        builder.build_from_entities(functions)
+
+        index = storage._symbol_index
+        assert index is not None
+        storage.add_edge_by_name(functions[0].id, "func_2", EdgeType.CALLS)
+        storage.add_edge_by_name(functions[0].id, "missing", EdgeType.CALLS, True)
+        builder.remove_file("mod_1.py")
+        assert storage._symbol_index is index
+
+        storage._symbol_index = None
+        assert storage.get_entities_by_symbol("func_2") == index["func_2"]
+        assert storage._symbol_index == index
+        assert index["func_1"] == ["external:func_1"]
+        assert index["missing"] == ["external:missing"]
+
+    def test_get_callers(self, storage, builder):
+        """Test getting callers of a function."""
+        callee = make_function("callee")
+        caller1 = make_function("caller1", 4, end_line=6, calls=["callee"])
+        caller2 = make_function("caller2", 8, end_line=10, calls=["callee"])
 
         builder.build_from_entities([callee, caller1, caller2])
 
         callers = get_callers(storage, callee.id)
-        assert len(callers) == 2
-        caller_names = {c["name"] for c in callers}
-        assert caller_names == {"caller1", "caller2"}
+        assert sorted(map(_name, callers)) == ["caller1", "caller2"]
 
-    def test_get_call_chain_outgoing(self):
+    def test_get_call_chain_outgoing(self, storage, call_chain):
         """Test getting outgoing call chain."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
-        func_a = Function(
-            repo="test", file_path="test.py", name="a",
-            start_line=1, end_line=2, signature="a()",
-            code="def a(): b()", calls=["b"],
-        )
-        func_b = Function(
-            repo="test", file_path="test.py", name="b",
-            start_line=4, end_line=5, signature="b()",
-            code="def b(): c()", calls=["c"],
-        )
-        func_c = Function(
-            repo="test", file_path="test.py", name="c",
-            start_line=7, end_line=8, signature="c()",
-            code="def c(): pass",
-        )
-
-        builder.build_from_entities([func_a, func_b, func_c])
+        func_a, func_b, func_c = call_chain
 
         chain = get_call_chain(storage, func_a.id, direction="outgoing")
-        assert chain["name"] == "a"
-        assert len(chain["calls"]) == 1
-        assert chain["calls"][0]["name"] == "b"
+        assert (chain["name"], list(map(_name, chain["calls"]))) == ("a", ["b"])
 
-    def test_get_call_chain_incoming(self):
+    def test_get_call_chain_incoming(self, storage, call_chain):
         """Test getting incoming call chain."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
-        func_a = Function(
-            repo="test", file_path="test.py", name="a",
-            start_line=1, end_line=2, signature="a()",
-            code="def a(): b()", calls=["b"],
-        )
-        func_b = Function(
-            repo="test", file_path="test.py", name="b",
-            start_line=4, end_line=5, signature="b()",
-            code="def b(): c()", calls=["c"],
-        )
-        func_c = Function(
-            repo="test", file_path="test.py", name="c",
-            start_line=7, end_line=8, signature="c()",
-            code="def c(): pass",
-        )
-
-        builder.build_from_entities([func_a, func_b, func_c])
+        func_a, func_b, func_c = call_chain
 
         chain = get_call_chain(storage, func_c.id, direction="incoming")
-        assert chain["name"] == "c"
-        assert len(chain["callers"]) == 1
-        assert chain["callers"][0]["name"] == "b"
+        assert (chain["name"], list(map(_name, chain["callers"]))) == ("c", ["b"])
 
-    def test_get_file_dependencies(self):
+    def test_get_file_dependencies(self, storage, builder):
         """Test getting file dependencies (imports)."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
         file1 = File(
             repo="test", file_path="main.py", name="main.py",
             start_line=1, end_line=10, language="python",
@@ -327,11 +372,8 @@ class TestGraphQueries:
         # Should have at least one dependency (external if not resolved)
         assert len(deps) >= 1
 
-    def test_get_file_dependents(self):
+    def test_get_file_dependents(self, storage, builder):
         """Test getting files that depend on a file."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
         # Create a dependency chain
         file_utils = File(
             repo="test", file_path="utils.py", name="utils.py",
@@ -351,11 +393,8 @@ class TestGraphQueries:
         # Result depends on import resolution success
         assert isinstance(dependents, list)
 
-    def test_get_class_hierarchy_parents(self):
+    def test_get_class_hierarchy_parents(self, storage, builder):
         """Test getting parent classes in hierarchy."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
         grandparent = Class(
             repo="test", file_path="test.py", name="GrandParent",
             start_line=1, end_line=3, code="class GrandParent: pass",
@@ -374,16 +413,10 @@ class TestGraphQueries:
         builder.build_from_entities([grandparent, parent, child])
 
         hierarchy = get_class_hierarchy(storage, child.id, direction="parents")
-        assert hierarchy["name"] == "Child"
-        assert "parents" in hierarchy
-        assert len(hierarchy["parents"]) == 1
-        assert hierarchy["parents"][0]["name"] == "Parent"
+        assert (hierarchy["name"], list(map(_name, hierarchy["parents"]))) == ("Child", ["Parent"])
 
-    def test_get_class_hierarchy_children(self):
+    def test_get_class_hierarchy_children(self, storage, builder):
         """Test getting child classes in hierarchy."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
         parent = Class(
             repo="test", file_path="test.py", name="Parent",
             start_line=1, end_line=3, code="class Parent: pass",
@@ -405,29 +438,18 @@ class TestGraphQueries:
         assert hierarchy["name"] == "Parent"
         assert "children" in hierarchy
         assert len(hierarchy["children"]) == 2
-        child_names = {c["name"] for c in hierarchy["children"]}
+        child_names = set(map(_name, hierarchy["children"]))
         assert child_names == {"Child1", "Child2"}
 
-    def test_get_file_structure(self):
+    def test_get_file_structure(self, storage, builder):
         """Test getting file structure (classes and functions)."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
-        func1 = Function(
-            repo="test", file_path="test.py", name="standalone",
-            start_line=1, end_line=2, signature="standalone()",
-            code="def standalone(): pass",
-        )
+        func1 = make_function("standalone")
         cls = Class(
             repo="test", file_path="test.py", name="MyClass",
             start_line=4, end_line=10, code="class MyClass: pass",
             methods=["method1"],
         )
-        method = Function(
-            repo="test", file_path="test.py", name="method1",
-            start_line=5, end_line=6, signature="method1(self)",
-            code="def method1(self): pass", class_name="MyClass",
-        )
+        method = make_function("method1", 5, class_name="MyClass")
         file = File(
             repo="test", file_path="test.py", name="test.py",
             start_line=1, end_line=10, language="python",
@@ -441,28 +463,13 @@ class TestGraphQueries:
         assert "classes" in structure
         assert "functions" in structure
 
-    def test_get_connected_components(self):
+    def test_get_connected_components(self, storage, builder):
         """Test getting connected components in the graph."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
         # Create two disconnected components
-        func_a = Function(
-            repo="test", file_path="test.py", name="a",
-            start_line=1, end_line=2, signature="a()",
-            code="def a(): b()", calls=["b"],
-        )
-        func_b = Function(
-            repo="test", file_path="test.py", name="b",
-            start_line=4, end_line=5, signature="b()",
-            code="def b(): pass",
-        )
+        func_a = make_function("a", calls=["b"])
+        func_b = make_function("b", 4)
         # Disconnected from a and b
-        func_c = Function(
-            repo="test", file_path="other.py", name="c",
-            start_line=1, end_line=2, signature="c()",
-            code="def c(): pass",
-        )
+        func_c = make_function("c", file_path="other.py")
 
         builder.build_from_entities([func_a, func_b, func_c])
 
@@ -470,28 +477,26 @@ class TestGraphQueries:
         # Should have at least 2 components (a-b connected, c isolated)
         assert len(components) >= 2
 
-    def test_find_paths(self):
-        """Test finding paths between entities."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
+    def test_get_connected_components_large_graph(self, storage, builder):
+        """Test components of a large synthetic graph of disjoint call chains."""
+        chains, length = 10, 1000
+        entities = [
+            make_function(
+                f"f{chain}_{i}",
+                file_path=f"chain{chain}.py",
+                calls=[f"f{chain}_{i + 1}"] if i + 1 < length else None,
+            )
+            for chain in range(chains)
+            for i in range(length)
+        ]
+        builder.build_from_entities(entities)
 
-        func_a = Function(
-            repo="test", file_path="test.py", name="a",
-            start_line=1, end_line=2, signature="a()",
-            code="def a(): b()", calls=["b"],
-        )
-        func_b = Function(
-            repo="test", file_path="test.py", name="b",
-            start_line=4, end_line=5, signature="b()",
-            code="def b(): c()", calls=["c"],
-        )
-        func_c = Function(
-            repo="test", file_path="test.py", name="c",
-            start_line=7, end_line=8, signature="c()",
-            code="def c(): pass",
-        )
+        components = get_connected_components(storage)
+        assert sorted(map(len, components)) == [length] * chains
 
-        builder.build_from_entities([func_a, func_b, func_c])
+    def test_find_paths(self, storage, call_chain):
+        """Test finding paths between entities."""
+        func_a, func_b, func_c = call_chain
 
         paths = find_paths(storage, func_a.id, func_c.id)
         assert len(paths) >= 1
@@ -499,21 +504,17 @@ class TestGraphQueries:
         assert func_a.id in paths[0]
         assert func_c.id in paths[0]
 
-    def test_find_paths_no_path(self):
-        """Test finding paths when no path exists."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
+    def test_find_paths_beyond_max_length(self, storage, call_chain):
+        """Test paths longer than max_length are not returned."""
+        func_a, _, func_c = call_chain
 
-        func_a = Function(
-            repo="test", file_path="test.py", name="a",
-            start_line=1, end_line=2, signature="a()",
-            code="def a(): pass",
-        )
-        func_b = Function(
-            repo="test", file_path="test.py", name="b",
-            start_line=4, end_line=5, signature="b()",
-            code="def b(): pass",
-        )
+        assert find_paths(storage, func_a.id, func_c.id, max_length=1) == []
+        assert len(find_paths(storage, func_a.id, func_c.id, max_length=2)) == 1
+
+    def test_find_paths_no_path(self, storage, builder):
+        """Test finding paths when no path exists."""
+        func_a = make_function("a")
+        func_b = make_function("b", 4)
 
         builder.build_from_entities([func_a, func_b])
 
@@ -524,22 +525,11 @@ class TestGraphQueries:
 class TestScopedSymbolTable:
     """Tests for the ScopedSymbolTable."""
 
-    def test_file_scoped_resolution(self):
+    def test_file_scoped_resolution(self, storage, builder):
         """Test that symbols are resolved within file scope."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
         # Same name in different files
-        func1 = Function(
-            repo="test", file_path="file1.py", name="process",
-            start_line=1, end_line=2, signature="process()",
-            code="def process(): pass",
-        )
-        func2 = Function(
-            repo="test", file_path="file2.py", name="process",
-            start_line=1, end_line=2, signature="process()",
-            code="def process(): pass",
-        )
+        func1 = make_function("process", file_path="file1.py")
+        func2 = make_function("process", file_path="file2.py")
 
         builder.build_from_entities([func1, func2])
 
@@ -548,19 +538,24 @@ class TestScopedSymbolTable:
         assert symbol_table.resolve("process", "file1.py") == func1.id
         assert symbol_table.resolve("process", "file2.py") == func2.id
 
-    def test_qualified_name_resolution(self):
+    def test_qualified_name_resolution(self, storage, builder):
         """Test qualified name resolution for methods."""
-        storage = GraphStorage()
-        builder = GraphBuilder(storage)
-
-        method = Function(
-            repo="test", file_path="test.py", name="method",
-            start_line=1, end_line=2, signature="method(self)",
-            code="def method(self): pass", class_name="MyClass",
-        )
+        method = make_function("method", class_name="MyClass")
 
         builder.build_from_entities([method])
 
         symbol_table = builder.symbol_table
         # Should resolve by qualified name
         assert symbol_table.resolve("MyClass.method") == method.id
+
+    def test_unregister_keeps_names_of_other_entities(self, storage, builder):
+        """Test removing one file leaves same-named symbols of other files resolvable."""
+        func1 = make_function("process", file_path="file1.py")
+        func2 = make_function("process", file_path="file2.py")
+        builder.build_from_entities([func1, func2])
+
+        builder.remove_file("file1.py")
+
+        symbol_table = builder.symbol_table
+        assert symbol_table.resolve("process") == func2.id
+        assert symbol_table.resolve("process", "file2.py") == func2.id
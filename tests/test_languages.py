@@ -1,17 +1,66 @@
 """Tests for Tree-sitter parsing across all supported languages."""
 
-from pathlib import Path
-from tempfile import NamedTemporaryFile
-
 import pytest
 
-from vibe_ragnar.parser import TreeSitterParser, Function, Class, File, TypeDefinition
+from vibe_ragnar.parser import AccessModifier, Class, File, ParseResult
+
+# (file name, language, source defining one function named "run")
+_RUN_FUNCTION_CASES = [
+    ("run.py", "python", "def run():\n    pass\n"),
+    ("run.ts", "typescript", "function run(): void {}\n"),
+    ("run.js", "javascript", "function run() {}\n"),
+    ("run.go", "go", "package main\n\nfunc run() {}\n"),
+    ("run.rs", "rust", "fn run() {}\n"),
+    ("run.java", "java", "class Runner {\n    void run() {}\n}\n"),
+    ("run.c", "c", "void run(void) {}\n"),
+    ("run.cpp", "cpp", "void run() {}\n"),
+    ("run.dart", "dart", "void run() {}\n"),
+]
+
+
+# (file name, source defining one class-like type named "Widget")
+_WIDGET_CLASS_CASES = [
+    ("widget.py", "class Widget:\n    pass\n"),
+    ("widget.ts", "class Widget {}\n"),
+    ("widget.js", "class Widget {}\n"),
+    ("widget.go", "package main\n\ntype Widget struct {}\n"),
+    ("widget.rs", "struct Widget {}\n"),
+    ("widget.java", "class Widget {}\n"),
+    ("widget.c", "struct Widget { int x; };\n"),
+    ("widget.cpp", "class Widget {};\n"),
+    ("widget.dart", "class Widget {}\n"),
+]
+
+
+class TestAllLanguages:
+    """Table-driven checks shared by every supported language."""
+
+    @pytest.mark.parametrize(("file_name", "language", "code"), _RUN_FUNCTION_CASES)
+    def test_function_and_file_entity(self, parser, file_name, language, code):
+        """Test each language yields its function and a file entity defining it."""
+        entities = parser.parse_source(code, file_name)
+        result = ParseResult.from_entities(entities)
+
+        functions = result.functions
+        assert [f.name for f in functions] == ["run"]
+
+        file_entity = entities[-1]
+        assert isinstance(file_entity, File)
+        assert file_entity.language == language
+        assert functions[0].id in file_entity.defines
+
+    @pytest.mark.parametrize(("file_name", "code"), _WIDGET_CLASS_CASES)
+    def test_class_entity(self, parser, file_name, code):
+        """Test each language's class, struct or equivalent becomes a Class entity."""
+        entities = parser.parse_source(code, file_name)
+
+        assert [(type(e), e.name) for e in entities] == [(Class, "Widget"), (File, file_name)]
 
 
 class TestPythonParsing:
     """Tests for Python parsing."""
 
-    def test_parse_async_function(self):
+    def test_parse_async_function(self, parser):
         """Test parsing async functions."""
         code = '''
 async def fetch_data(url: str) -> dict:
@@ -19,18 +68,14 @@ async def fetch_data(url: str) -> dict:
     response = await get(url)
     return response.json()
 '''
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.py"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         assert functions[0].name == "fetch_data"
         assert functions[0].is_async is True
 
-    def test_parse_decorated_function(self):
+    def test_parse_decorated_function(self, parser):
         """Test parsing decorated functions."""
         code = '''
 @staticmethod
@@ -41,23 +86,19 @@ def helper():
 def decorated():
     pass
 '''
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.py"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 2
 
-        helper = next(f for f in functions if f.name == "helper")
+        helper = result.functions_by_name["helper"]
         assert "staticmethod" in helper.decorators
         assert helper.is_static is True
 
-        decorated = next(f for f in functions if f.name == "decorated")
+        decorated = result.functions_by_name["decorated"]
         assert "decorator" in decorated.decorators
 
-    def test_parse_nested_class(self):
+    def test_parse_nested_class(self, parser):
         """Test parsing nested classes."""
         code = '''
 class Outer:
@@ -65,19 +106,14 @@ class Outer:
         def method(self):
             pass
 '''
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        functions = [e for e in entities if isinstance(e, Function)]
-        method = next((f for f in functions if f.name == "method"), None)
+        result = ParseResult.from_entities(parser.parse_source(code, "test.py"))
+
+        method = result.functions_by_name.get("method")
         assert method is not None
         # Should have full nested path
         assert method.class_name == "Outer.Inner"
 
-    def test_parse_class_inheritance(self):
+    def test_parse_class_inheritance(self, parser):
         """Test parsing class inheritance."""
         code = '''
 class Base:
@@ -86,17 +122,12 @@ class Base:
 class Child(Base):
     pass
 '''
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        classes = [e for e in entities if isinstance(e, Class)]
-        child = next(c for c in classes if c.name == "Child")
+        result = ParseResult.from_entities(parser.parse_source(code, "test.py"))
+
+        child = result.classes_by_name["Child"]
         assert "Base" in child.bases
 
-    def test_parse_private_method(self):
+    def test_parse_private_method(self, parser):
         """Test parsing private methods (Python convention)."""
         code = '''
 class MyClass:
@@ -109,37 +140,29 @@ class MyClass:
     def __private_method(self):
         pass
 '''
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.py"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 3
 
 
 class TestTypeScriptParsing:
     """Tests for TypeScript parsing."""
 
-    def test_parse_function_with_types(self):
+    def test_parse_function_with_types(self, parser):
         """Test parsing TypeScript functions with type annotations."""
         code = '''
 function greet(name: string): string {
     return `Hello, ${name}!`;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".ts", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.ts"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         assert functions[0].name == "greet"
 
-    def test_parse_interface(self):
+    def test_parse_interface(self, parser):
         """Test parsing TypeScript interfaces."""
         code = '''
 interface User {
@@ -148,18 +171,14 @@ interface User {
     email?: string;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".ts", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.ts"))
 
-        types = [e for e in entities if isinstance(e, TypeDefinition)]
+        types = result.types
         assert len(types) == 1
         assert types[0].name == "User"
         assert types[0].kind == "interface"
 
-    def test_parse_class_with_methods(self):
+    def test_parse_class_with_methods(self, parser):
         """Test parsing TypeScript classes."""
         code = '''
 class Calculator {
@@ -175,19 +194,15 @@ class Calculator {
     }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".ts", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.ts"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "Calculator"
         assert "add" in classes[0].methods
         assert "create" in classes[0].methods
 
-    def test_parse_async_arrow_function(self):
+    def test_parse_async_arrow_function(self, parser):
         """Test parsing async arrow functions."""
         # Note: Variable-assigned arrow functions in TypeScript need
         # specific queries. Test the pattern we DO support.
@@ -197,31 +212,23 @@ async function fetchData(url: string): Promise<Response> {
     return response;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".ts", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.ts"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) >= 1
         # Should detect async
         assert functions[0].is_async or functions[0].name == "fetchData"
 
-    def test_parse_generic_function(self):
+    def test_parse_generic_function(self, parser):
         """Test parsing generic functions."""
         code = '''
 function identity<T>(arg: T): T {
     return arg;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".ts", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.ts"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         assert functions[0].name == "identity"
 
@@ -229,24 +236,20 @@ function identity<T>(arg: T): T {
 class TestJavaScriptParsing:
     """Tests for JavaScript parsing."""
 
-    def test_parse_function_declaration(self):
+    def test_parse_function_declaration(self, parser):
         """Test parsing function declarations."""
         code = '''
 function greet(name) {
     return "Hello, " + name;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.js"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         assert functions[0].name == "greet"
 
-    def test_parse_const_function(self):
+    def test_parse_const_function(self, parser):
         """Test parsing const-assigned functions."""
         # Note: This tests the JS-specific query for variable-assigned functions
         # The query may need further refinement for all edge cases
@@ -259,19 +262,15 @@ function multiply(a, b) {
     return a * b;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.js"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         # At minimum, the regular function should be captured
         assert len(functions) >= 1
         names = [f.name for f in functions]
         assert "multiply" in names
 
-    def test_parse_class(self):
+    def test_parse_class(self, parser):
         """Test parsing JavaScript classes."""
         code = '''
 class Animal {
@@ -284,17 +283,13 @@ class Animal {
     }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.js"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "Animal"
 
-    def test_parse_commonjs_require(self):
+    def test_parse_commonjs_require(self, parser):
         """Test parsing CommonJS require statements."""
         code = '''
 const fs = require("fs");
@@ -304,19 +299,15 @@ function readFile(filename) {
     return fs.readFileSync(filename);
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.js"))
 
-        files = [e for e in entities if isinstance(e, File)]
+        files = result.files
         assert len(files) == 1
         # Check that imports are extracted
         imports = files[0].imports
         assert len(imports) >= 2
 
-    def test_parse_es6_import(self):
+    def test_parse_es6_import(self, parser):
         """Test parsing ES6 import statements."""
         code = '''
 import { readFile } from "fs";
@@ -326,20 +317,16 @@ export function main() {
     const file = readFile("test.txt");
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".js", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.js"))
 
-        files = [e for e in entities if isinstance(e, File)]
+        files = result.files
         assert len(files) == 1
 
 
 class TestGoParsing:
     """Tests for Go parsing."""
 
-    def test_parse_function(self):
+    def test_parse_function(self, parser):
         """Test parsing Go functions."""
         code = '''
 package main
@@ -348,17 +335,13 @@ func Add(a, b int) int {
     return a + b
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".go", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.go"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         assert functions[0].name == "Add"
 
-    def test_parse_method(self):
+    def test_parse_method(self, parser):
         """Test parsing Go methods (receiver functions)."""
         code = '''
 package main
@@ -371,21 +354,17 @@ func (c *Calculator) Add(n int) {
     c.value += n
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".go", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.go"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         assert functions[0].name == "Add"
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "Calculator"
 
-    def test_parse_interface(self):
+    def test_parse_interface(self, parser):
         """Test parsing Go interfaces."""
         code = '''
 package main
@@ -394,17 +373,13 @@ type Reader interface {
     Read(p []byte) (n int, err error)
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".go", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.go"))
 
-        types = [e for e in entities if isinstance(e, TypeDefinition)]
+        types = result.types
         assert len(types) == 1
         assert types[0].name == "Reader"
 
-    def test_parse_constructor_convention(self):
+    def test_parse_constructor_convention(self, parser):
         """Test parsing Go constructor conventions (NewXxx)."""
         code = '''
 package main
@@ -417,17 +392,12 @@ func NewServer(port int) *Server {
     return &Server{port: port}
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".go", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        functions = [e for e in entities if isinstance(e, Function)]
-        constructor = next(f for f in functions if f.name == "NewServer")
+        result = ParseResult.from_entities(parser.parse_source(code, "test.go"))
+
+        constructor = result.functions_by_name["NewServer"]
         assert constructor.is_constructor is True
 
-    def test_parse_imports(self):
+    def test_parse_imports(self, parser):
         """Test parsing Go imports."""
         code = '''
 package main
@@ -441,13 +411,9 @@ func main() {
     fmt.Println("Hello")
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".go", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.go"))
 
-        files = [e for e in entities if isinstance(e, File)]
+        files = result.files
         assert len(files) == 1
         assert len(files[0].imports) >= 2
 
@@ -455,43 +421,38 @@ func main() {
 class TestRustParsing:
     """Tests for Rust parsing."""
 
-    def test_parse_function(self):
-        """Test parsing Rust functions."""
+    def test_parse_function_and_visibility(self, parser):
+        """Test parsing Rust functions and their visibility modifiers."""
         code = '''
-fn add(a: i32, b: i32) -> i32 {
+pub fn add(a: i32, b: i32) -> i32 {
     a + b
 }
+
+fn private_function() {}
 '''
-        with NamedTemporaryFile(mode="w", suffix=".rs", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.rs"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
-        assert len(functions) == 1
-        assert functions[0].name == "add"
+        functions = result.functions
+        assert [f.name for f in functions] == ["add", "private_function"]
+        assert functions[0].access_modifier == AccessModifier.PUBLIC
+        assert functions[1].access_modifier == AccessModifier.PRIVATE
 
-    def test_parse_async_function(self):
+    def test_parse_async_function(self, parser):
         """Test parsing Rust async functions."""
         code = '''
 async fn fetch_data() {
     let response = client.get("url").await;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".rs", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.rs"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         # Note: async detection depends on tree-sitter Rust grammar
         # The function should at least be captured
         assert functions[0].name == "fetch_data"
 
-    def test_parse_impl_block(self):
+    def test_parse_impl_block(self, parser):
         """Test parsing Rust impl blocks."""
         code = '''
 struct Calculator {
@@ -508,20 +469,16 @@ impl Calculator {
     }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".rs", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.rs"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) >= 2
 
-        new_fn = next((f for f in functions if f.name == "new"), None)
+        new_fn = result.functions_by_name.get("new")
         assert new_fn is not None
         assert new_fn.is_constructor is True
 
-    def test_parse_enum(self):
+    def test_parse_enum(self, parser):
         """Test parsing Rust enums."""
         code = '''
 enum Color {
@@ -530,38 +487,18 @@ enum Color {
     Blue,
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".rs", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.rs"))
 
-        types = [e for e in entities if isinstance(e, TypeDefinition)]
+        types = result.types
         assert len(types) == 1
         assert types[0].name == "Color"
         assert types[0].kind == "enum"
 
-    def test_parse_visibility(self):
-        """Test parsing Rust visibility modifiers."""
-        code = '''
-pub fn public_function() {}
-
-fn private_function() {}
-'''
-        with NamedTemporaryFile(mode="w", suffix=".rs", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        functions = [e for e in entities if isinstance(e, Function)]
-        assert len(functions) == 2
-
 
 class TestJavaParsing:
     """Tests for Java parsing."""
 
-    def test_parse_class(self):
+    def test_parse_class(self, parser):
         """Test parsing Java classes."""
         code = '''
 public class Calculator {
@@ -577,37 +514,29 @@ public class Calculator {
     }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".java", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.java"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "Calculator"
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) >= 2
 
-    def test_parse_interface(self):
+    def test_parse_interface(self, parser):
         """Test parsing Java interfaces."""
         code = '''
 public interface Runnable {
     void run();
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".java", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.java"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "Runnable"
 
-    def test_parse_inheritance(self):
+    def test_parse_inheritance(self, parser):
         """Test parsing Java inheritance."""
         code = '''
 public class Animal {
@@ -620,17 +549,12 @@ public class Dog extends Animal {
     }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".java", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        classes = [e for e in entities if isinstance(e, Class)]
-        dog = next(c for c in classes if c.name == "Dog")
+        result = ParseResult.from_entities(parser.parse_source(code, "test.java"))
+
+        dog = result.classes_by_name["Dog"]
         assert "Animal" in dog.bases
 
-    def test_parse_imports(self):
+    def test_parse_imports(self, parser):
         """Test parsing Java imports."""
         code = '''
 import java.util.List;
@@ -642,17 +566,13 @@ public class Main {
     }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".java", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.java"))
 
-        files = [e for e in entities if isinstance(e, File)]
+        files = result.files
         assert len(files) == 1
         assert len(files[0].imports) >= 2
 
-    def test_parse_constructor(self):
+    def test_parse_constructor(self, parser):
         """Test parsing Java constructors."""
         code = '''
 public class Person {
@@ -663,14 +583,9 @@ public class Person {
     }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".java", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        functions = [e for e in entities if isinstance(e, Function)]
-        constructor = next((f for f in functions if f.name == "Person"), None)
+        result = ParseResult.from_entities(parser.parse_source(code, "test.java"))
+
+        constructor = result.functions_by_name.get("Person")
         assert constructor is not None
         assert constructor.is_constructor is True
 
@@ -678,24 +593,20 @@ public class Person {
 class TestCParsing:
     """Tests for C parsing."""
 
-    def test_parse_function(self):
+    def test_parse_function(self, parser):
         """Test parsing C functions."""
         code = '''
 int add(int a, int b) {
     return a + b;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".c", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.c"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         assert functions[0].name == "add"
 
-    def test_parse_struct(self):
+    def test_parse_struct(self, parser):
         """Test parsing C structs."""
         code = '''
 struct Point {
@@ -703,17 +614,13 @@ struct Point {
     int y;
 };
 '''
-        with NamedTemporaryFile(mode="w", suffix=".c", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.c"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "Point"
 
-    def test_parse_includes(self):
+    def test_parse_includes(self, parser):
         """Test parsing C includes."""
         code = '''
 #include <stdio.h>
@@ -724,17 +631,13 @@ int main() {
     return 0;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".c", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.c"))
 
-        files = [e for e in entities if isinstance(e, File)]
+        files = result.files
         assert len(files) == 1
         assert len(files[0].imports) >= 2
 
-    def test_parse_function_calls(self):
+    def test_parse_function_calls(self, parser):
         """Test parsing function calls in C."""
         code = '''
 void process() {
@@ -743,13 +646,9 @@ void process() {
     cleanup();
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".c", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.c"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         process = functions[0]
         assert "init" in process.calls
         assert "compute" in process.calls
@@ -759,7 +658,7 @@ void process() {
 class TestCPPParsing:
     """Tests for C++ parsing."""
 
-    def test_parse_class(self):
+    def test_parse_class(self, parser):
         """Test parsing C++ classes."""
         code = '''
 class Calculator {
@@ -775,17 +674,13 @@ private:
     int value;
 };
 '''
-        with NamedTemporaryFile(mode="w", suffix=".cpp", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.cpp"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "Calculator"
 
-    def test_parse_namespace_function(self):
+    def test_parse_namespace_function(self, parser):
         """Test parsing functions in namespaces."""
         code = '''
 namespace math {
@@ -794,17 +689,13 @@ namespace math {
     }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".cpp", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.cpp"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         assert functions[0].name == "add"
 
-    def test_parse_method_calls(self):
+    def test_parse_method_calls(self, parser):
         """Test parsing method calls in C++."""
         code = '''
 void process() {
@@ -813,18 +704,14 @@ void process() {
     ptr->call();
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".cpp", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.cpp"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         process = functions[0]
         # Should capture method calls
         assert len(process.calls) > 0
 
-    def test_parse_inheritance(self):
+    def test_parse_inheritance(self, parser):
         """Test parsing C++ inheritance."""
         code = '''
 class Base {
@@ -838,13 +725,9 @@ public:
     }
 };
 '''
-        with NamedTemporaryFile(mode="w", suffix=".cpp", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.cpp"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         # Should capture both classes
         assert len(classes) >= 2
         class_names = {c.name for c in classes}
@@ -852,7 +735,7 @@ public:
         assert "Derived" in class_names
         # Note: C++ inheritance extraction may need query refinement
 
-    def test_parse_template_function(self):
+    def test_parse_template_function(self, parser):
         """Test parsing C++ template functions."""
         code = '''
 template<typename T>
@@ -860,13 +743,9 @@ T max(T a, T b) {
     return (a > b) ? a : b;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".cpp", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.cpp"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         # Template functions should be captured
         assert len(functions) >= 1
 
@@ -874,41 +753,33 @@ T max(T a, T b) {
 class TestDartParsing:
     """Tests for Dart/Flutter parsing."""
 
-    def test_parse_function(self):
+    def test_parse_function(self, parser):
         """Test parsing Dart functions."""
         code = '''
 void greet(String name) {
   print('Hello, $name!');
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         assert functions[0].name == "greet"
 
-    def test_parse_async_function(self):
+    def test_parse_async_function(self, parser):
         """Test parsing Dart async functions."""
         code = '''
 Future<String> fetchData() async {
   return await http.get('url');
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 1
         assert functions[0].name == "fetchData"
 
-    def test_parse_class_with_methods(self):
+    def test_parse_class_with_methods(self, parser):
         """Test parsing Dart class with methods."""
         code = '''
 class Greeter {
@@ -923,23 +794,19 @@ class Greeter {
   }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "Greeter"
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         assert len(functions) == 2
         names = {f.name for f in functions}
         assert "sayHello" in names
         assert "sayGoodbye" in names
 
-    def test_parse_getter_setter(self):
+    def test_parse_getter_setter(self, parser):
         """Test parsing Dart getters and setters."""
         code = '''
 class Counter {
@@ -950,19 +817,15 @@ class Counter {
   set value(int v) => _value = v;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         # Should capture both getter and setter
         assert len(functions) >= 2
         names = {f.name for f in functions}
         assert "value" in names
 
-    def test_parse_mixin(self):
+    def test_parse_mixin(self, parser):
         """Test parsing Dart mixins."""
         code = '''
 mixin Swimmer {
@@ -971,34 +834,26 @@ mixin Swimmer {
   }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "Swimmer"
 
-    def test_parse_extension(self):
+    def test_parse_extension(self, parser):
         """Test parsing Dart extensions."""
         code = '''
 extension StringExtension on String {
   String get reversed => split('').reversed.join();
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "StringExtension"
 
-    def test_parse_enum(self):
+    def test_parse_enum(self, parser):
         """Test parsing Dart enums."""
         code = '''
 enum Status {
@@ -1007,17 +862,13 @@ enum Status {
   rejected,
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        classes = [e for e in entities if isinstance(e, Class)]
+        classes = result.classes
         assert len(classes) == 1
         assert classes[0].name == "Status"
 
-    def test_parse_imports(self):
+    def test_parse_imports(self, parser):
         """Test parsing Dart imports."""
         code = """
 import 'dart:io';
@@ -1028,19 +879,16 @@ void main() {
   runApp(MyApp());
 }
 """
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        files = [e for e in entities if isinstance(e, File)]
+        files = result.files
         assert len(files) == 1
         # Check that imports are extracted
         imports = files[0].imports
         assert len(imports) >= 3
+        assert parser.extract_imports(code, "test.dart") == imports
 
-    def test_no_duplicate_functions(self):
+    def test_no_duplicate_functions(self, parser):
         """Test that functions are not duplicated (both top-level and methods)."""
         code = '''
 void topLevelFunction() {
@@ -1057,13 +905,9 @@ class MyClass {
   }
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         # Should be exactly 3: topLevelFunction, methodOne, methodTwo
         assert len(functions) == 3
         names = [f.name for f in functions]
@@ -1071,18 +915,11 @@ class MyClass {
         assert names.count("methodOne") == 1
         assert names.count("methodTwo") == 1
 
-    def test_supports_dart_file(self):
-        """Test that .dart files are supported."""
-        parser = TreeSitterParser("test-repo")
-        assert parser.supports_file("main.dart")
-        assert parser.supports_file("lib/widget.dart")
-        assert parser.supports_file("/path/to/app.dart")
-
 
 class TestDartConstructorParsing:
     """Tests for Dart constructor parsing."""
 
-    def test_default_constructor(self):
+    def test_default_constructor(self, parser):
         """Test default constructor extraction."""
         code = '''
 class Point {
@@ -1090,19 +927,15 @@ class Point {
   Point(this.x, this.y);
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         constructors = [f for f in functions if f.is_constructor]
         assert len(constructors) == 1
         assert constructors[0].name == "Point"
         assert constructors[0].class_name == "Point"
 
-    def test_named_constructor(self):
+    def test_named_constructor(self, parser):
         """Test named constructor extraction."""
         code = '''
 class Point {
@@ -1112,13 +945,9 @@ class Point {
   Point.fromJson(Map json) : x = json['x'], y = json['y'];
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         constructors = [f for f in functions if f.is_constructor]
         assert len(constructors) == 3
         names = {c.name for c in constructors}
@@ -1126,7 +955,7 @@ class Point {
         assert "origin" in names  # Named constructor
         assert "fromJson" in names  # Named constructor
 
-    def test_factory_constructor(self):
+    def test_factory_constructor(self, parser):
         """Test factory constructor extraction."""
         code = '''
 class Logger {
@@ -1136,13 +965,9 @@ class Logger {
   Logger._internal();
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         constructors = [f for f in functions if f.is_constructor]
         # Should have: factory Logger(), factory Logger.named(), Logger._internal()
         assert len(constructors) >= 3
@@ -1151,7 +976,7 @@ class Logger {
         assert "named" in names
         assert "_internal" in names
 
-    def test_const_constructor(self):
+    def test_const_constructor(self, parser):
         """Test const constructor extraction."""
         code = '''
 class ImmutablePoint {
@@ -1160,13 +985,9 @@ class ImmutablePoint {
   const ImmutablePoint.origin() : x = 0, y = 0;
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
 
-        functions = [e for e in entities if isinstance(e, Function)]
+        functions = result.functions
         constructors = [f for f in functions if f.is_constructor]
         assert len(constructors) == 2
         names = {c.name for c in constructors}
@@ -1177,7 +998,7 @@ class ImmutablePoint {
 class TestDartCallExtraction:
     """Tests for Dart call extraction."""
 
-    def test_simple_function_call(self):
+    def test_simple_function_call(self, parser):
         """Test simple function calls."""
         code = '''
 void main() {
@@ -1185,19 +1006,14 @@ void main() {
   doSomething();
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        functions = [e for e in entities if isinstance(e, Function)]
-        main_func = next((fn for fn in functions if fn.name == "main"), None)
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
+
+        main_func = result.functions_by_name.get("main")
         assert main_func is not None
         assert "print" in main_func.calls
         assert "doSomething" in main_func.calls
 
-    def test_method_calls(self):
+    def test_method_calls(self, parser):
         """Test method calls with receivers."""
         code = '''
 void main() {
@@ -1205,14 +1021,9 @@ void main() {
   str.toLowerCase();
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        functions = [e for e in entities if isinstance(e, Function)]
-        main_func = next((fn for fn in functions if fn.name == "main"), None)
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
+
+        main_func = result.functions_by_name.get("main")
         assert main_func is not None
         assert "add" in main_func.calls
         assert "toLowerCase" in main_func.calls
@@ -1222,27 +1033,22 @@ void main() {
         assert add_call is not None
         assert add_call.receiver == "list"
 
-    def test_chained_calls(self):
+    def test_chained_calls(self, parser):
         """Test chained method calls."""
         code = '''
 void main() {
   list.map((e) => e * 2).where((e) => e > 5).toList();
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        functions = [e for e in entities if isinstance(e, Function)]
-        main_func = next((fn for fn in functions if fn.name == "main"), None)
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
+
+        main_func = result.functions_by_name.get("main")
         assert main_func is not None
         assert "map" in main_func.calls
         assert "where" in main_func.calls
         assert "toList" in main_func.calls
 
-    def test_cascade_calls(self):
+    def test_cascade_calls(self, parser):
         """Test cascade notation calls."""
         code = '''
 void main() {
@@ -1252,14 +1058,9 @@ void main() {
     ..build();
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        functions = [e for e in entities if isinstance(e, Function)]
-        main_func = next((fn for fn in functions if fn.name == "main"), None)
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
+
+        main_func = result.functions_by_name.get("main")
         assert main_func is not None
         assert "setWidth" in main_func.calls
         assert "setHeight" in main_func.calls
@@ -1270,7 +1071,7 @@ void main() {
         assert set_width is not None
         assert set_width.receiver == "builder"
 
-    def test_constructor_calls(self):
+    def test_constructor_calls(self, parser):
         """Test constructor invocations."""
         code = '''
 void main() {
@@ -1278,14 +1079,9 @@ void main() {
   var p2 = Point.origin();
 }
 '''
-        with NamedTemporaryFile(mode="w", suffix=".dart", delete=False) as f:
-            f.write(code)
-            f.flush()
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
-
-        functions = [e for e in entities if isinstance(e, Function)]
-        main_func = next((fn for fn in functions if fn.name == "main"), None)
+        result = ParseResult.from_entities(parser.parse_source(code, "test.dart"))
+
+        main_func = result.functions_by_name.get("main")
         assert main_func is not None
         assert "Point" in main_func.calls
         assert "origin" in main_func.calls
@@ -1,29 +1,34 @@
 """Tests for the Tree-sitter parser."""
 
-from pathlib import Path
-from tempfile import NamedTemporaryFile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 import pytest
 
-from vibe_ragnar.parser import TreeSitterParser, Function, Class, File
+from vibe_ragnar.parser import (
+    Class,
+    File,
+    Function,
+    ParseCache,
+    ParseResult,
+    TreeSitterParser,
+    init_parse_worker,
+)
 
 
 class TestTreeSitterParser:
     """Tests for TreeSitterParser class."""
 
-    def test_parse_python_function(self):
+    def test_parse_python_function(self, parser, tmp_path):
         """Test parsing a simple Python function."""
         code = '''
 def hello(name: str) -> str:
     """Say hello to someone."""
     return f"Hello, {name}!"
 '''
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code)
-            f.flush()
-
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        source_file = tmp_path / "test.py"
+        source_file.write_text(code)
+        entities = parser.parse_file(source_file)
 
         # Should have function + file
         functions = [e for e in entities if isinstance(e, Function)]
@@ -38,7 +43,7 @@ def hello(name: str) -> str:
         assert func.class_name is None
         assert func.content_hash is not None
 
-    def test_parse_python_class_with_methods(self):
+    def test_parse_python_class_with_methods(self, parser, tmp_path):
         """Test parsing a Python class with methods."""
         code = '''
 class Greeter:
@@ -50,12 +55,9 @@ class Greeter:
     def greet(self, name: str) -> str:
         return f"{self.prefix}, {name}!"
 '''
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code)
-            f.flush()
-
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        source_file = tmp_path / "test.py"
+        source_file.write_text(code)
+        entities = parser.parse_file(source_file)
 
         classes = [e for e in entities if isinstance(e, Class)]
         functions = [e for e in entities if isinstance(e, Function)]
@@ -72,7 +74,7 @@ class Greeter:
         for func in functions:
             assert func.class_name == "Greeter"
 
-    def test_parse_function_calls(self):
+    def test_parse_function_calls(self, parser, tmp_path):
         """Test extraction of function calls."""
         code = '''
 def process():
@@ -80,12 +82,9 @@ def process():
     data = transform(result)
     return save(data)
 '''
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code)
-            f.flush()
-
-            parser = TreeSitterParser("test-repo")
-            entities = parser.parse_file(Path(f.name))
+        source_file = tmp_path / "test.py"
+        source_file.write_text(code)
+        entities = parser.parse_file(source_file)
 
         functions = [e for e in entities if isinstance(e, Function)]
         assert len(functions) == 1
@@ -95,7 +94,7 @@ def process():
         assert "transform" in func.calls
         assert "save" in func.calls
 
-    def test_entity_id_format(self):
+    def test_entity_id_format(self, tmp_path):
         """Test entity ID format."""
         code = '''
 def standalone():
@@ -105,12 +104,11 @@ class MyClass:
     def method(self):
         pass
 '''
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code)
-            f.flush()
+        source_file = tmp_path / "test.py"
+        source_file.write_text(code)
 
-            parser = TreeSitterParser("my-repo")
-            entities = parser.parse_file(Path(f.name))
+        parser = TreeSitterParser("my-repo")
+        entities = parser.parse_file(source_file)
 
         functions = [e for e in entities if isinstance(e, Function)]
 
@@ -125,42 +123,317 @@ class MyClass:
         assert method.id.startswith("my-repo:")
         assert method.id.endswith(":MyClass.method")
 
-    def test_supports_file(self):
+    @pytest.mark.parametrize(
+        ("file_name", "supported"),
+        [
+            ("test.py", True),
+            ("test.ts", True),
+            ("test.js", True),
+            ("test.go", True),
+            ("test.rs", True),
+            ("test.java", True),
+            ("test.c", True),
+            ("test.cpp", True),
+            ("main.dart", True),
+            ("lib/widget.dart", True),
+            ("/path/to/app.dart", True),
+            ("test.txt", False),
+            ("test.md", False),
+            ("test.json", False),
+            ("SRC/MAIN.PY", True),
+            ("pkg.py/README", False),
+            ("archive.tar.gz", False),
+            (".py", False),
+        ],
+    )
+    def test_supports_file(self, parser, file_name, supported):
         """Test file extension detection."""
-        parser = TreeSitterParser("test")
+        assert parser.supports_file(file_name) is supported
+
+    def test_parse_source_matches_parse_file(self, parser, tmp_path):
+        """Test in-memory parsing yields the same entities as parsing the file."""
+        code = "class Shape:\n    def area(self):\n        return 0\n"
+        (tmp_path / "shape.py").write_text(code)
+
+        from_file = parser.parse_file(tmp_path / "shape.py", repo_root=tmp_path)
+        from_source = parser.parse_source(code, "shape.py")
+
+        assert from_source == from_file
+        assert parser.parse_source(code, "shape.txt") == []
+
+    def test_extract_imports_only(self, parser):
+        """Test the import-only path matches the imports of the file entity."""
+        code = "import os\nfrom pathlib import Path\n\n\ndef main():\n    pass\n"
+
+        file_entity = parser.parse_source(code, "main.py")[-1]
+
+        assert parser.extract_imports(code, "main.py") == file_entity.imports
+        assert parser.extract_imports(code, "main.txt") == []
+
+    def test_parse_result_groups_entities_by_kind(self, parser):
+        """Test ParseResult splits parsed entities by kind, keeping their order."""
+        code = "class Shape:\n    def area(self):\n        return 0\n\n\ndef draw():\n    pass\n"
+        entities = parser.parse_source(code, "shape.py")
+
+        result = ParseResult.from_entities(entities)
+
+        assert [f.name for f in result.functions] == ["area", "draw"]
+        assert [c.name for c in result.classes] == ["Shape"]
+        assert result.types == []
+        assert result.files == [entities[-1]]
+        assert result.functions_by_name["draw"] is result.functions[1]
+        assert result.classes_by_name == {"Shape": result.classes[0]}
+
+    def test_unchanged_source_is_not_reparsed(self, parser, monkeypatch):
+        """Test parsing the same path and content again is served from the cache."""
+        code = "def cached():\n    pass\n"
+        entities = parser.parse_source(code, "cached.py")
+
+        def fail(language):
+            raise AssertionError("source was parsed again")
+
+        monkeypatch.setattr(parser, "_get_parser", fail)
+        assert parser.parse_source(code, "cached.py") == entities
+        with pytest.raises(AssertionError):
+            parser.parse_source(code + "\n", "cached.py")
+
+    def test_persistent_cache_is_shared_across_parsers(self, tmp_path, monkeypatch):
+        """Test a new parser loads unchanged files from the persistent parse cache."""
+        code = "def cached():\n    pass\n"
+        cache = ParseCache(tmp_path / "parse_cache.sqlite", "test-repo")
+        entities = TreeSitterParser("test-repo", cache=cache).parse_source(code, "cached.py")
+        cache.close()
+
+        cache = ParseCache(tmp_path / "parse_cache.sqlite", "test-repo")
+        parser = TreeSitterParser("test-repo", cache=cache)
+
+        def fail(*args):
+            raise AssertionError("source was parsed again")
+
+        monkeypatch.setattr(parser, "_extract_entities", fail)
+        assert parser.parse_source(code, "cached.py") == entities
+        with pytest.raises(AssertionError):
+            parser.parse_source(code + "\n", "cached.py")
+        cache.close()
+
+    def test_repeated_identifiers_are_shared(self, parser):
+        """Test call names from different files are the same string object."""
+        first = parser.parse_source("def a():\n    shared_helper()\n", "first.py")
+        second = parser.parse_source("def b():\n    shared_helper()\n", "second.py")
+
+        assert first[0].calls[0] is second[0].calls[0]
+
+    def test_nested_calls_are_detected(self, parser):
+        """Test calls in another call's arguments are marked nested."""
+        entities = parser.parse_source("def f():\n    outer(inner(1))\n", "nested.py")
+
+        details = {call.name: call.is_nested for call in entities[0].call_details}
+        assert details == {"outer": False, "inner": True}
+
+    def test_calls_are_in_source_order(self, parser):
+        """Test calls are in source order within each kind: plain calls, then method calls."""
+        body = "".join(f"    obj{i}.m{i}(f{i}(x))\n" for i in range(20))
+        entities = parser.parse_source(f"def run():\n{body}", "ordered.py")
+
+        function = entities[0]
+        assert function.calls == [f"f{i}" for i in range(20)] + [f"m{i}" for i in range(20)]
+        assert [call.line for call in function.call_details] == list(range(2, 22)) * 2
 
-        assert parser.supports_file("test.py")
-        assert parser.supports_file("test.ts")
-        assert parser.supports_file("test.js")
-        assert parser.supports_file("test.go")
-        assert parser.supports_file("test.rs")
-        assert parser.supports_file("test.java")
-        assert parser.supports_file("test.c")
-        assert parser.supports_file("test.cpp")
+    def test_incremental_reparse_matches_full_parse(self):
+        """Test re-parsing an edited file from its previous tree gives a fresh parse's result."""
+        code = "class Store:\n    def get(self):\n        return load()\n\n\ndef main():\n    run()\n"
+        edited = code.replace("    run()\n", "    helper = Store()\n    helper.get()\n")
+        edited = "import os\n" + edited
 
-        assert not parser.supports_file("test.txt")
-        assert not parser.supports_file("test.md")
-        assert not parser.supports_file("test.json")
+        parser = TreeSitterParser("test-repo")
+        parser.parse_source(code, "store.py")
+        incremental = parser.parse_source(edited, "store.py")
 
-    def test_content_hash_changes(self):
+        assert incremental == TreeSitterParser("test-repo").parse_source(edited, "store.py")
+
+    def test_incremental_reparse_of_one_line_in_large_file(self):
+        """Test editing one line of a long file re-parses to the same entities as a cold parse."""
+        code = "".join(
+            f"def handler_{i}(event):\n    return process_{i}(event)\n\n" for i in range(340)
+        )
+        edited = code.replace("return process_170(event)", "return dispatch(event, retries=3)")
+
+        parser = TreeSitterParser("test-repo")
+        parser.parse_source(code, "handlers.py")
+        incremental = parser.parse_source(edited, "handlers.py")
+
+        assert incremental == TreeSitterParser("test-repo").parse_source(edited, "handlers.py")
+        assert incremental[170].calls == ["dispatch"]
+
+    def test_content_hash_changes(self, tmp_path):
         """Test that content hash changes when code changes."""
         code1 = "def foo(): pass"
         code2 = "def foo(): return 1"
 
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code1)
-            f.flush()
+        source_file = tmp_path / "test1.py"
+        source_file.write_text(code1)
 
-            parser = TreeSitterParser("test")
-            entities1 = parser.parse_file(Path(f.name))
-
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(code2)
-            f.flush()
+        parser = TreeSitterParser("test")
+        entities1 = parser.parse_file(source_file)
 
-            entities2 = parser.parse_file(Path(f.name))
+        source_file = tmp_path / "test2.py"
+        source_file.write_text(code2)
+        entities2 = parser.parse_file(source_file)
 
         func1 = [e for e in entities1 if isinstance(e, Function)][0]
         func2 = [e for e in entities2 if isinstance(e, Function)][0]
 
         assert func1.content_hash != func2.content_hash
+
+    def test_class_methods_exclude_nested_functions(self, parser, tmp_path):
+        """Test that only direct class members are reported as methods."""
+        code = '''
+class Service:
+    @staticmethod
+    def build():
+        def helper():
+            pass
+        return helper
+
+    def run(self):
+        class Inner:
+            def inner_method(self):
+                pass
+        return Inner
+'''
+        source_file = tmp_path / "test.py"
+        source_file.write_text(code)
+        entities = parser.parse_file(source_file)
+
+        service = next(e for e in entities if isinstance(e, Class) and e.name == "Service")
+        assert service.methods == ["build", "run"]
+
+    def test_class_methods_include_conditional_definitions(self, parser, tmp_path):
+        """Test that methods defined in if/try blocks of a class body are reported."""
+        code = '''
+class Compat:
+    if sys.version_info >= (3, 11):
+        def modern(self):
+            if True:
+                def hidden():
+                    pass
+    elif PY2:
+        def legacy(self):
+            pass
+    else:
+        @property
+        def fallback(self):
+            pass
+
+    try:
+        def fast(self):
+            pass
+    except ImportError:
+        def slow(self):
+            pass
+    finally:
+        def cleanup(self):
+            pass
+'''
+        source_file = tmp_path / "test.py"
+        source_file.write_text(code)
+        entities = parser.parse_file(source_file)
+
+        compat = next(e for e in entities if isinstance(e, Class) and e.name == "Compat")
+        assert compat.methods == ["modern", "legacy", "fallback", "fast", "slow", "cleanup"]
+
+    def test_parse_file_without_definitions(self, parser, tmp_path):
+        """Test that a file with no definitions still yields its file entity."""
+        code = '''
+import os
+
+CONFIG = {"path": os.getcwd()}
+'''
+        source_file = tmp_path / "test.py"
+        source_file.write_text(code)
+        entities = parser.parse_file(source_file)
+
+        assert len(entities) == 1
+        assert isinstance(entities[0], File)
+        assert entities[0].imports == ["os"]
+        assert entities[0].defines == []
+
+    def test_parse_directory(self, parser, tmp_path):
+        """Test parsing every supported file in a directory."""
+        root = tmp_path
+        (root / "app").mkdir()
+        for i in range(8):
+            (root / "app" / f"mod{i}.py").write_text(f"def func{i}():\n    pass\n")
+        (root / "notes.txt").write_text("def not_code(): pass\n")
+        entities = parser.parse_directory(root, max_workers=4)
+
+        functions = [e for e in entities if isinstance(e, Function)]
+        files = [e for e in entities if isinstance(e, File)]
+
+        assert {f.name for f in functions} == {f"func{i}" for i in range(8)}
+        assert len(files) == 8
+        assert all(not f.file_path.startswith("/") for f in files)
+
+    def test_imports_deduplicated_in_source_order(self, parser, tmp_path):
+        """Test that imports keep their source order without duplicates."""
+        code = '''
+import sys
+from collections import OrderedDict
+import os
+import sys
+'''
+        source_file = tmp_path / "test.py"
+        source_file.write_text(code)
+        entities = parser.parse_file(source_file)
+
+        file_entity = next(e for e in entities if isinstance(e, File))
+        assert file_entity.imports == ["sys", "collections", "os"]
+
+    def test_parse_files_keeps_input_order(self, parser, tmp_path):
+        """Test batch parsing returns one entity list per file, in order."""
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"mod{i}.py"
+            path.write_text(f"def func{i}():\n    pass\n")
+            paths.append(path)
+        paths.append(tmp_path / "missing.py")
+
+        results = parser.parse_files(paths, repo_root=tmp_path, max_workers=3)
+
+        assert [r[0].name for r in results[:-1]] == [f"func{i}" for i in range(6)]
+        assert results[-1] == []
+
+    def test_parse_directory_skips_ignored_dirs(self, parser, tmp_path):
+        """Test that ignored and hidden directories are pruned unless included."""
+        root = tmp_path
+        for dir_name in ("app", "node_modules", ".hidden", "build"):
+            (root / dir_name).mkdir()
+            (root / dir_name / "mod.py").write_text(f"def in_{dir_name.strip('.')}():\n    pass\n")
+        default_names = {
+            e.name for e in parser.parse_directory(root) if isinstance(e, Function)
+        }
+        included_names = {
+            e.name
+            for e in parser.parse_directory(root, include_dirs=["build"])
+            if isinstance(e, Function)
+        }
+
+        assert default_names == {"in_app"}
+        assert included_names == {"in_app", "in_build"}
+
+    def test_parse_directory_with_process_pool(self, parser, tmp_path):
+        """Test parsing a directory on worker processes."""
+        root = tmp_path
+        for i in range(4):
+            (root / f"mod{i}.py").write_text(f"def func{i}():\n    pass\n")
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_parse_worker,
+            initargs=("test-repo",),
+        ) as executor:
+            entities = parser.parse_directory(root, executor=executor)
+
+        functions = [e for e in entities if isinstance(e, Function)]
+        assert {f.name for f in functions} == {f"func{i}" for i in range(4)}
+        assert all(f.repo == "test-repo" for f in functions)
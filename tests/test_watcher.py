@@ -0,0 +1,214 @@
+"""Tests for the debounced file watcher handler."""
+
+import errno
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from watchdog.events import FileMovedEvent
+
+from vibe_ragnar.watcher.handler import DebouncedFileHandler, FileWatcher, _existing_paths
+
+
+class TestDebouncedFileHandler:
+    """Tests for DebouncedFileHandler class."""
+
+    def test_changes_are_debounced_into_one_batch(self):
+        """Test that a burst of events is delivered as a single batch."""
+        batches: list[dict[str, str]] = []
+        done = threading.Event()
+
+        def on_changes(changes: dict[str, str]) -> None:
+            batches.append(changes)
+            done.set()
+
+        handler = DebouncedFileHandler(on_changes, debounce_seconds=0.1)
+        for i in range(5):
+            handler._handle_change(f"/work/app/mod{i}.py", "upsert")
+        handler._handle_change("/work/app/mod0.py", "upsert")
+
+        assert done.wait(timeout=5)
+        handler.stop()
+
+        assert len(batches) == 1
+        assert set(batches[0]) == {f"/work/app/mod{i}.py" for i in range(5)}
+
+    def test_max_batch_size_forces_flush(self):
+        """Test that reaching the batch size flushes without waiting for quiet."""
+        batches: list[dict[str, str]] = []
+        done = threading.Event()
+
+        def on_changes(changes: dict[str, str]) -> None:
+            batches.append(changes)
+            done.set()
+
+        handler = DebouncedFileHandler(on_changes, debounce_seconds=60.0, max_batch_size=3)
+        for i in range(3):
+            handler._handle_change(f"/work/app/mod{i}.py", "upsert")
+
+        assert done.wait(timeout=5)
+        handler.stop()
+
+        assert len(batches[0]) == 3
+
+    def test_max_delay_forces_flush(self):
+        """Test that a continuous event stream is flushed after the maximum delay."""
+        done = threading.Event()
+
+        handler = DebouncedFileHandler(
+            lambda changes: done.set(), debounce_seconds=60.0, max_delay_seconds=0.0
+        )
+        handler._handle_change("/work/app/mod.py", "upsert")
+
+        assert done.wait(timeout=5)
+        handler.stop()
+
+    def test_stop_ends_worker_and_discards_pending(self):
+        """Test that stop() joins the debounce thread without flushing."""
+        batches: list[dict[str, str]] = []
+
+        handler = DebouncedFileHandler(batches.append, debounce_seconds=60.0)
+        handler._handle_change("/work/app/mod.py", "upsert")
+        handler.stop()
+
+        assert not handler._worker.is_alive()
+        assert batches == []
+
+    def test_should_process_checks_only_paths_below_root(self):
+        """Test ignore rules apply below the watched root, not to its ancestors."""
+        handler = DebouncedFileHandler(lambda changes: None, root=Path("/tmp/build/repo"))
+        handler.stop()
+
+        assert handler._should_process("/tmp/build/repo/app/main.py")
+        assert not handler._should_process("/tmp/build/repo/node_modules/lib/index.js")
+        assert not handler._should_process("/tmp/build/repo/.venv/site.py")
+        assert not handler._should_process("/tmp/build/repo/app/README.md")
+
+    def test_rename_is_reported_as_move(self):
+        """Test a rename is delivered as one move of the new path."""
+        batches: list[dict] = []
+        done = threading.Event()
+
+        def on_changes(changes: dict) -> None:
+            batches.append(changes)
+            done.set()
+
+        with TemporaryDirectory() as tmp:
+            old_path = str(Path(tmp) / "old.py")
+            new_path = str(Path(tmp) / "new.py")
+            Path(new_path).write_text("")
+
+            handler = DebouncedFileHandler(on_changes, debounce_seconds=0.1, root=Path(tmp))
+            handler.on_moved(FileMovedEvent(old_path, new_path))
+            assert done.wait(timeout=5)
+            handler.stop()
+
+        assert batches == [{new_path: ("move", old_path)}]
+
+    def test_rename_over_recreated_path_is_not_a_move(self):
+        """Test a move whose old path exists again is split into upserts."""
+        batches: list[dict] = []
+        done = threading.Event()
+
+        def on_changes(changes: dict) -> None:
+            batches.append(changes)
+            done.set()
+
+        with TemporaryDirectory() as tmp:
+            old_path = str(Path(tmp) / "old.py")
+            new_path = str(Path(tmp) / "new.py")
+            Path(old_path).write_text("")
+            Path(new_path).write_text("")
+
+            handler = DebouncedFileHandler(on_changes, debounce_seconds=0.1, root=Path(tmp))
+            handler.on_moved(FileMovedEvent(old_path, new_path))
+            assert done.wait(timeout=5)
+            handler.stop()
+
+        assert batches == [{old_path: ("upsert", None), new_path: ("upsert", None)}]
+
+
+class TestExistingPaths:
+    """Tests for the batched existence check used when flushing changes."""
+
+    def test_existing_paths(self):
+        """Test existence is detected per directory, including removed directories."""
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "a.py").write_text("")
+            (root / "b.py").write_text("")
+            (root / "sub").mkdir()
+            (root / "sub" / "c.py").write_text("")
+
+            paths = [
+                str(root / "a.py"),
+                str(root / "b.py"),
+                str(root / "gone.py"),
+                str(root / "sub" / "c.py"),
+                str(root / "removed" / "d.py"),
+                str(root / "removed" / "e.py"),
+            ]
+            existing = _existing_paths(paths)
+
+        assert existing == {str(root / "a.py"), str(root / "b.py"), str(root / "sub" / "c.py")}
+
+
+class TestFileWatcher:
+    """Tests for FileWatcher class."""
+
+    def test_ignored_top_level_directories_are_not_watched(self):
+        """Test only non-ignored top-level trees get watches, including new ones."""
+        batches: list[dict] = []
+        seen = threading.Event()
+
+        def on_changes(changes: dict) -> None:
+            batches.append(changes)
+            seen.set()
+
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "app").mkdir()
+            (root / "node_modules").mkdir()
+
+            with FileWatcher(root, on_changes, debounce_seconds=0.2) as watcher:
+                assert set(watcher._subdirectory_watches) == {str(root / "app")}
+
+                (root / "lib").mkdir()
+                (root / "lib" / "util.py").write_text("x = 1\n")
+                assert seen.wait(timeout=5)
+
+                assert str(root / "lib") in watcher._subdirectory_watches
+
+        assert any(str(root / "lib" / "util.py") in batch for batch in batches)
+
+    def test_failed_subdirectory_watch_falls_back_to_recursive_root_watch(self):
+        """Test that running out of inotify instances leaves one recursive watch."""
+        batches: list[dict] = []
+        seen = threading.Event()
+
+        def on_changes(changes: dict) -> None:
+            batches.append(changes)
+            seen.set()
+
+        with TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "app").mkdir()
+            (root / "lib").mkdir()
+
+            watcher = FileWatcher(root, on_changes, debounce_seconds=0.2)
+            schedule = watcher._observer.schedule
+
+            def failing_schedule(handler, path, **kwargs):
+                if path == str(root / "lib"):
+                    raise OSError(errno.EMFILE, "inotify instance limit reached")
+                return schedule(handler, path, **kwargs)
+
+            watcher._observer.schedule = failing_schedule
+            with watcher:
+                assert watcher._subdirectory_watches == {}
+                assert [emitter.watch.path for emitter in watcher._observer.emitters] == [str(root)]
+
+                (root / "app" / "main.py").write_text("x = 1\n")
+                assert seen.wait(timeout=5)
+
+        assert any(str(root / "app" / "main.py") in batch for batch in batches)